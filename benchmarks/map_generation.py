@@ -0,0 +1,57 @@
+'''
+Measures how long Map.create_map takes depending on map size and on
+% of the map covered in hexes. Run from repository root:
+
+    python benchmarks/map_generation.py
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import map
+import game
+
+
+MAP_SIZES = (10, 25, 50, 100)
+COVERAGES = (25, 50, 75, 100)
+PLAYERS_NUMBER = 20
+REPEATS = 5
+
+
+def measure_create_map(map_size, coverage):
+    '''
+    Returns average time of creating a map in seconds
+
+    Args:
+        map_size (int): map's size in hexes, map is square
+
+        coverage (int): % of the map covered in hexes
+
+    Returns:
+        float: average time of Map.create_map in seconds
+    '''
+
+    players = [game.Player((0, 0, 0)) for player in range(PLAYERS_NUMBER)]
+    hex_number = max(PLAYERS_NUMBER, map_size * map_size * coverage // 100)
+    map_ = map.Map((map_size, map_size), hex_number, players, 4, 32,
+                   (1920, 1080))
+
+    return timeit.timeit(map_.create_map, number=REPEATS) / REPEATS
+
+
+def main():
+    print('map size' + ''.join(
+        '{:>10}'.format(str(coverage) + '%') for coverage in COVERAGES))
+
+    for map_size in MAP_SIZES:
+        times = [measure_create_map(map_size, coverage)
+                 for coverage in COVERAGES]
+        print('{:>8}'.format('{0}x{0}'.format(map_size)) + ''.join(
+            '{:>8.1f}ms'.format(time_ * 1000) for time_ in times))
+
+
+if __name__ == '__main__':
+    main()
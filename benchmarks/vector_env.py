@@ -0,0 +1,74 @@
+'''
+Compares ammount of fights per second of headless games played one by one
+with VectorEnv advancing many boards at once. Run from repository root:
+
+    python benchmarks/vector_env.py
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import headless
+import vector_env
+
+
+MAP_SIZE = (20, 20)
+HEX_NUMBER = 200
+PLAYERS_NUMBER = 4
+GAMES_NUMBER = 5
+BOARDS_NUMBER = 500
+STEPS = 500
+
+
+def measure_headless():
+    '''
+    Returns fights per second of headless games played one by one
+
+    Returns:
+        float: fights per second
+    '''
+
+    fights = 0
+    start_time = time.perf_counter()
+
+    for seed in range(GAMES_NUMBER):
+        fights += headless.play_game(MAP_SIZE, HEX_NUMBER, PLAYERS_NUMBER,
+                                     seed=seed).fights
+
+    return fights / (time.perf_counter() - start_time)
+
+
+def measure_vector_env():
+    '''
+    Returns fights per second of VectorEnv with random attacks, turn ends
+    on boards where current player has no possible attack
+
+    Returns:
+        float: fights per second
+    '''
+
+    env = vector_env.VectorEnv(BOARDS_NUMBER, MAP_SIZE, HEX_NUMBER,
+                               PLAYERS_NUMBER, seed=0)
+
+    fights = 0
+    start_time = time.perf_counter()
+
+    for step in range(STEPS):
+        attacking_indices, defending_indices = env.sample_attacks()
+        is_attack, is_won = env.step(attacking_indices, defending_indices)
+        fights += int(is_attack.sum())
+        env.end_turn(~is_attack)
+
+    return fights / (time.perf_counter() - start_time)
+
+
+def main():
+    print('headless games: {:>10.0f} fights/s'.format(measure_headless()))
+    print('vector env:     {:>10.0f} fights/s'.format(measure_vector_env()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import math
+import numpy
+
+
+class Camera:
+    '''
+    Camera transforms hex's geometry from board space to screen space.
+    In board space hex's middle is given as (x, y) lattice point, where x is
+    measured in half_side_length_root3 units and y in rows of hexes.
+    '''
+
+    def __init__(self, side_length):
+        '''
+        Initializes camera object
+
+        Args:
+            side_length (int): hex's side length in pixels
+        '''
+
+        # Position shift needed for moving around the map
+        self.offset = [0, 0]
+
+        # Incremented on every change, so cached results depending on
+        # camera can be invalidated
+        self.version = 0
+
+        self.set_side_length(side_length)
+
+    def set_side_length(self, side_length):
+        '''
+        Sets hex's side length, it's the camera's scale
+
+        Args:
+            side_length (int): hex's side length in pixels
+        '''
+
+        self.side_length = side_length
+        self.half_side_length = int(self.side_length / 2)
+        self.half_side_length_root3 = int(self.half_side_length * math.sqrt(3))
+        self.row_height = self.side_length + self.half_side_length
+
+        # Hex's polygon points relative to hex's middle
+        self.polygon_offsets = numpy.array((
+            (0, self.side_length),
+            (self.half_side_length_root3, self.half_side_length),
+            (self.half_side_length_root3, -self.half_side_length),
+            (0, -self.side_length),
+            (-self.half_side_length_root3, -self.half_side_length),
+            (-self.half_side_length_root3, self.half_side_length)),
+            dtype=numpy.int64)
+
+        self.version += 1
+
+    def move(self, shift):
+        '''
+        Moves camera by given shift
+
+        Args:
+            shift (int, int): position shift
+        '''
+
+        self.offset = [item1 + item2 for item1, item2 in
+                       zip(self.offset, shift)]
+        self.version += 1
+
+    def reset(self):
+        '''
+        Moves camera back to starting position
+        '''
+
+        self.offset = [0, 0]
+        self.version += 1
+
+    def to_screen(self, lattice_points, offset=None):
+        '''
+        Transforms hex's middles from board space to screen space
+
+        Args:
+            lattice_points (numpy.ndarray): (n, 2) array of lattice points
+
+            offset (int, int): offset used instead of camera's one,
+                (0, 0) gives pixels of the whole map drawn at current scale
+
+        Returns:
+            numpy.ndarray: (n, 2) array of middle points on screen
+        '''
+
+        if offset is None:
+            offset = self.offset
+
+        middles = numpy.empty(lattice_points.shape, dtype=numpy.int64)
+        middles[:, 0] = lattice_points[:, 0] * self.half_side_length_root3 + \
+            offset[0]
+        middles[:, 1] = lattice_points[:, 1] * self.row_height + \
+            self.side_length + offset[1]
+
+        return middles
+
+    def to_screen_polygons(self, lattice_points, offset=None):
+        '''
+        Transforms hex's polygons from board space to screen space
+
+        Args:
+            lattice_points (numpy.ndarray): (n, 2) array of lattice points
+
+            offset (int, int): offset used instead of camera's one
+
+        Returns:
+            numpy.ndarray: (n, 6, 2) array of polygon points on screen
+        '''
+
+        return self.to_screen(lattice_points, offset)[:, numpy.newaxis, :] + \
+            self.polygon_offsets
+
+    def get_board_size(self, max_lattice_point):
+        '''
+        Returns size in pixels of the whole map drawn at current scale
+        with (0, 0) offset
+
+        Args:
+            max_lattice_point (int, int): the highest lattice point's
+                coordinates
+
+        Returns:
+            (int, int): width and height
+        '''
+
+        return ((max_lattice_point[0] + 1) * self.half_side_length_root3 + 1,
+                max_lattice_point[1] * self.row_height +
+                2 * self.side_length + 1)
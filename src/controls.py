@@ -22,6 +22,9 @@ class Control:
         self.font = font
         self.color = color
 
+        # True if control changed since it was rendered the last time
+        self.is_dirty = True
+
     def is_point_in_rect(self, point):
         '''
         Returns true if point is in button's rect
@@ -41,7 +44,16 @@ class Control:
 
 
     @abc.abstractmethod
-    def render(self, surface):
+    def get_bounding_rect(self):
+        '''
+        Abstract method returning rectangle covering everything control
+        renders
+        '''
+
+        pass
+
+    @abc.abstractmethod
+    def render(self, surface, offset=(0, 0)):
         '''
         Abstract rendering method
         '''
@@ -80,17 +92,37 @@ class Button(Control):
         self.final_text_rect[2] = text_rect[2]
         self.final_text_rect[3] = text_rect[3]
 
-    def render(self, surface):
+    def get_bounding_rect(self):
+        '''
+        Returns rectangle covering button with its outline
+
+        Returns:
+            pygame.Rect: bounding rectangle
+        '''
+
+        return pygame.Rect(self.rect).inflate(6, 6)
+
+    def render(self, surface, offset=(0, 0)):
         '''
         Renders button on surface
 
         Arguments:
             surface (pygame.Surface): surface to render on
+
+            offset (int, int): position of surface's top left corner on
+                screen
         '''
 
-        pygame.draw.rect(surface, self.color, self.rect)
-        pygame.draw.lines(surface, (0, 0, 0), True, self.lines, 4)
-        surface.blit(self.text, self.final_text_rect)
+        pygame.draw.rect(surface, self.color,
+                         pygame.Rect(self.rect).move(-offset[0], -offset[1]))
+        pygame.draw.lines(surface, (0, 0, 0), True,
+                          [[x - offset[0], y - offset[1]]
+                           for x, y in self.lines], 4)
+        surface.blit(self.text,
+                     pygame.Rect(self.final_text_rect).move(-offset[0],
+                                                            -offset[1]))
+
+        self.is_dirty = False
 
 
 class Slider(Control):
@@ -137,10 +169,19 @@ class Slider(Control):
 
         self.slider_color = slider_color
 
-        self.title = self.base_title + " " + str(self.value) 
+        self.__set_title()
 
         self.__set_starting_position()
 
+    def __set_title(self):
+        '''
+        Sets title with current value and renders it, rendered title is
+        kept until the value changes
+        '''
+
+        self.title = self.base_title + " " + str(self.value)
+        self.title_text = self.font.render(self.title, True, (255, 255, 255))
+
 
     def __set_starting_position(self):
         '''
@@ -161,6 +202,8 @@ class Slider(Control):
             shift {list(int, int)}
         '''
 
+        position = self.slider_rect[0]
+
         self.slider_rect[0] += shift[0]
         if self.slider_rect[0] < self.rect[0]:
             self.slider_rect[0] = self.rect[0]
@@ -173,22 +216,46 @@ class Slider(Control):
                            (self.slider_rect[0] - self.rect[0])) / \
             (self.rect[2] - self.slider_rect[2])
 
-        self.value = int(
+        value = int(
             self.min_value + (self.max_value - self.min_value) *
             (1.0 - slider_relative)) // \
             self.step * self.step
-        
-        self.title = self.base_title + " " + str(self.value) 
 
-    def render(self, surface):
+        if value != self.value:
+            self.value = value
+            self.__set_title()
+            self.is_dirty = True
+        elif self.slider_rect[0] != position:
+            self.is_dirty = True
+
+    def get_bounding_rect(self):
+        '''
+        Returns rectangle covering slider with its title
+
+        Returns:
+            pygame.Rect: bounding rectangle
+        '''
+
+        return pygame.Rect(self.rect).union(pygame.Rect(
+            self.text_rect[:2], self.title_text.get_size()))
+
+    def render(self, surface, offset=(0, 0)):
         '''
         Renders slider on surface
 
         Args:
             surface {pygame.Surface}: surface to render on
+
+            offset (int, int): position of surface's top left corner on
+                screen
         '''
 
-        pygame.draw.rect(surface, self.color, self.rect)
-        pygame.draw.rect(surface, self.slider_color, self.slider_rect)
-        title_text = self.font.render(self.title, True, (255, 255, 255))
-        surface.blit(title_text, self.text_rect)
+        pygame.draw.rect(surface, self.color,
+                         pygame.Rect(self.rect).move(-offset[0], -offset[1]))
+        pygame.draw.rect(surface, self.slider_color,
+                         pygame.Rect(self.slider_rect).move(-offset[0],
+                                                            -offset[1]))
+        surface.blit(self.title_text, (self.text_rect[0] - offset[0],
+                                       self.text_rect[1] - offset[1]))
+
+        self.is_dirty = False
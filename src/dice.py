@@ -0,0 +1,72 @@
+import numpy
+
+
+def roll_fight(rng, attacking_dice_number, defending_dice_number,
+               die_sides_number):
+    '''
+    Rolls dice of both sides of a fight in one call
+
+    Args:
+        rng (numpy.random.Generator): random numbers generator
+
+        attacking_dice_number (int): number of attacking dice
+
+        defending_dice_number (int): number of defending dice
+
+        die_sides_number (int): how many sides single die has
+
+    Returns:
+        (int, int): attacking and defending power, sums of rolled dice
+    '''
+
+    rolls = rng.integers(1, die_sides_number + 1,
+                         size=attacking_dice_number + defending_dice_number)
+
+    return (int(rolls[:attacking_dice_number].sum()),
+            int(rolls[attacking_dice_number:].sum()))
+
+
+def resolve_fights(rng, attacking_dice_numbers, defending_dice_numbers,
+                   die_sides_number):
+    '''
+    Resolves many independent fights, all dice are rolled in one call.
+    Attacker wins only if his power is higher than defender's power.
+    Results are the same as of roll_fight called for every fight with
+    the same generator
+
+    Args:
+        rng (numpy.random.Generator): random numbers generator
+
+        attacking_dice_numbers (numpy.ndarray): number of attacking dice
+            in every fight
+
+        defending_dice_numbers (numpy.ndarray): number of defending dice
+            in every fight
+
+        die_sides_number (int): how many sides single die has
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray): attacking powers,
+            defending powers and True for every fight won by attacker
+    '''
+
+    # Dice are rolled fight after fight, attacker first, in the same
+    # order as roll_fight would roll them
+    dice_numbers = numpy.stack((
+        numpy.asarray(attacking_dice_numbers, dtype=numpy.int64).ravel(),
+        numpy.asarray(defending_dice_numbers, dtype=numpy.int64).ravel()),
+        axis=1).ravel()
+
+    rolls = rng.integers(1, die_sides_number + 1, size=dice_numbers.sum())
+
+    # Every roll is summed into power of the side it was rolled for
+    sides = numpy.repeat(numpy.arange(len(dice_numbers)), dice_numbers)
+    powers = numpy.bincount(sides, weights=rolls,
+                            minlength=len(dice_numbers)).astype(
+                                numpy.int64).reshape(-1, 2)
+
+    attacking_powers = powers[:, 0]
+    defending_powers = powers[:, 1]
+
+    return (attacking_powers, defending_powers,
+            attacking_powers > defending_powers)
@@ -0,0 +1,195 @@
+import numpy
+
+
+def assign_owners(hex_number, players_number, rng):
+    '''
+    Returns owner of every hex. All players get the same ammount of hexes,
+    then leftovers are distributed randomly with maximum of one additional
+    hex per player
+
+    Args:
+        hex_number (int): ammount of hexes
+
+        players_number (int): ammount of players
+
+        rng (numpy.random.Generator): random numbers generator
+
+    Returns:
+        numpy.ndarray: player's index for every hex
+    '''
+
+    hex_per_player = numpy.full(players_number, hex_number // players_number)
+    hex_per_player[rng.choice(players_number, hex_number % players_number,
+                              replace=False)] += 1
+
+    owners = numpy.repeat(numpy.arange(players_number, dtype=numpy.int16),
+                          hex_per_player)
+    rng.shuffle(owners)
+
+    return owners
+
+
+def bounded_multinomial(total, capacity, rng):
+    '''
+    Randomly distributes total between slots without exceeding any slot's
+    capacity. Every free unit of capacity has the same chance to be filled
+
+    Args:
+        total (int): ammount to distribute, at most sum of capacity
+
+        capacity (numpy.ndarray): free capacity of every slot
+
+        rng (numpy.random.Generator): random numbers generator
+
+    Returns:
+        numpy.ndarray: ammount added to every slot
+    '''
+
+    capacity = numpy.asarray(capacity, dtype=numpy.int64)
+    if total <= 0 or len(capacity) == 0:
+        return numpy.zeros(len(capacity), dtype=numpy.int64)
+
+    return rng.multivariate_hypergeometric(capacity, total)
+
+
+def bounded_multinomials(totals, capacities, rng):
+    '''
+    Randomly distributes totals between slots of many independent rows
+    without exceeding any slot's capacity, the same way as
+    bounded_multinomial. Every free unit of capacity gets a random key
+    and units with the lowest keys in every row are filled, so all rows
+    are drawn at once with one sort
+
+    Args:
+        totals (numpy.ndarray): ammount to distribute in every row, at most
+            sum of row's capacities
+
+        capacities (numpy.ndarray): (rows, slots) free capacity of slots
+
+        rng (numpy.random.Generator): random numbers generator
+
+    Returns:
+        numpy.ndarray: (rows, slots) ammount added to every slot
+    '''
+
+    capacities = numpy.asarray(capacities, dtype=numpy.int64)
+    totals = numpy.asarray(totals, dtype=numpy.int64)
+    rows_number, slots_number = capacities.shape
+
+    # Flat slot of every unit of capacity, units are ordered by row
+    units = numpy.repeat(numpy.arange(capacities.size), capacities.ravel())
+    rows = units // slots_number
+
+    # Keys are in [row, row + 1), so sorting keeps rows together
+    order = numpy.argsort(rows + rng.random(len(units)))
+    row_starts = numpy.concatenate(
+        ((0,), numpy.cumsum(capacities.sum(axis=1))[:-1]))
+    is_filled = numpy.arange(len(units)) - row_starts[rows] < totals[rows]
+
+    return numpy.bincount(units[order[is_filled]],
+                          minlength=capacities.size).reshape(
+                              rows_number, slots_number)
+
+
+def score_dice_distributions(dice_distributions, owners, players_number):
+    '''
+    Returns the worst relative difference between average dice number per
+    player and dice number of any player, for every candidate distribution
+
+    Args:
+        dice_distributions (numpy.ndarray): (candidates, hexes) array with
+            number of dice per hex
+
+        owners (numpy.ndarray): player's index for every hex
+
+        players_number (int): ammount of players
+
+    Returns:
+        numpy.ndarray: score of every candidate, lower is fairer
+    '''
+
+    candidates_number = dice_distributions.shape[0]
+
+    # Counts number of dice per player in all candidates at once
+    players_dice_number = numpy.bincount(
+        (owners + players_number *
+         numpy.arange(candidates_number)[:, numpy.newaxis]).ravel(),
+        weights=dice_distributions.ravel(),
+        minlength=candidates_number * players_number).reshape(
+            candidates_number, players_number)
+    players_dice_number = players_dice_number[
+        :, numpy.bincount(owners, minlength=players_number) > 0]
+
+    min_ = players_dice_number.min(axis=1)
+    max_ = players_dice_number.max(axis=1)
+    average = players_dice_number.mean(axis=1)
+
+    with numpy.errstate(divide='ignore'):
+        return numpy.maximum(average / min_ - 1.0, 1.0 - average / max_)
+
+
+def create_dice_distribution(owners, players_number, dice_per_hex, rng,
+                             fair_variation=0.3, batch_size=8,
+                             max_batch_size=1024, max_batches=10):
+    '''
+    Returns number of dice on every hex. Randomly distributes dice,
+    min dice_per_hex - 2, max dice_per_hex. Leftovers are then randomly
+    distributed to other hexes with a maximum of dice_per_hex + 2.
+
+    Candidates are created in batches and the first fair one is returned.
+    Batch size doubles after every batch without fair candidate, after
+    max_batches the fairest candidate is returned
+
+    Args:
+        owners (numpy.ndarray): player's index for every hex
+
+        players_number (int): ammount of players
+
+        dice_per_hex (int): average count of dice per hex
+
+        rng (numpy.random.Generator): random numbers generator
+
+        fair_variation (float): maximum variation between average and
+            lowest or highest dice number of a player (between 0.2 and 0.4)
+
+        batch_size (int): ammount of candidates in the first batch
+
+        max_batch_size (int): maximum ammount of candidates in a batch
+
+        max_batches (int): maximum ammount of batches
+
+    Returns:
+        numpy.ndarray: number of dice on every hex
+    '''
+
+    if not (0.2 <= fair_variation <= 0.4):
+        raise Exception('fair_variation isn\'t in possible range')
+
+    best_score = None
+    best_distribution = None
+
+    for batch in range(max_batches):
+        dice_distributions = rng.integers(
+            dice_per_hex - 2, dice_per_hex + 1,
+            size=(batch_size, len(owners)))
+        dice_left = (dice_per_hex - dice_distributions).sum(axis=1)
+
+        for candidate in range(batch_size):
+            dice_distributions[candidate] += bounded_multinomial(
+                dice_left[candidate],
+                dice_per_hex + 2 - dice_distributions[candidate], rng)
+
+        scores = score_dice_distributions(dice_distributions, owners,
+                                          players_number)
+        best_candidate = numpy.argmin(scores)
+
+        if best_score is None or scores[best_candidate] < best_score:
+            best_score = scores[best_candidate]
+            best_distribution = dice_distributions[best_candidate]
+
+        if best_score <= fair_variation:
+            break
+
+        batch_size = min(2 * batch_size, max_batch_size)
+
+    return best_distribution
@@ -1,15 +1,24 @@
+import collections
 import pygame
 import sys
+import time
 
 import map
 
 
+# Maximum time in seconds spent on skipped fights in a single frame
+SKIPPED_FIGHTS_TIME_LIMIT = 0.02
+# Ammount of last frames used to measure CPU time per frame
+MEASURED_FRAMES_NUMBER = 60
+
+
 class EventHandler:
     '''
     This class containts communication with user and main game loop
     '''
 
-    def __init__(self, map_, graphics, gameplay):
+    def __init__(self, map_, graphics, gameplay, max_fps=60,
+                 idle_timeout=500):
         '''
         Initializes EventHandler object
 
@@ -19,40 +28,186 @@ class EventHandler:
             graphics (Graphics): Graphics object
 
             gameplay (Gameplay): Gameplay object
+
+            max_fps (int): maximum frames per second, 0 means no limit
+
+            idle_timeout (int): maximum time of waiting for events in ms
+                when nothing happens on screen
         '''
 
         self.map_ = map_
         self.graphics = graphics
         self.gameplay = gameplay
 
+        self.max_fps = max_fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.frame_cpu_times = collections.deque(
+            maxlen=MEASURED_FRAMES_NUMBER)
+        # Ammount of frames since the last change of the screen
+        self.idle_frames = 0
+
         self.last_mouse_pos = None
         # It is used to calculate slider shift
         self.last_mouse_pos_for_sliders = None
         self.slider_targeted = None
 
+        # Input accumulated from all events of a frame, it's applied once
+        # after they are handled
+        self.map_shift = [0, 0]
+        self.slider_shift = [0, 0]
+        self.zoom_steps = 0
+
 
     def event_loop(self):
         '''
-        Main game loop
+        Main game loop. Frames are limited to max fps. When the game is
+        idle the loop sleeps until an event comes instead of redrawing
         '''
 
         while True:
-            self.handle_events()
+            cpu_time = time.process_time()
+
+            if self.is_idle():
+                self.idle_frames += 1
+            else:
+                self.idle_frames = 0
+
+            # The first idle frame is drawn, so the screen shows changes
+            # made after rendering of the previous frame
+            if self.idle_frames > 1:
+                events = self.__wait_for_events()
+                self.handle_events(events)
+
+                if not self.__is_redraw_needed(events):
+                    continue
+            else:
+                self.handle_events()
+
             self.tick()
 
+            self.frame_cpu_times.append(time.process_time() - cpu_time)
+            self.clock.tick(self.max_fps)
+
+    def is_idle(self):
+        '''
+        Returns True if nothing changes on screen without user's input:
+        it's human's turn, no fight is pending and nothing is dragged
+
+        Returns:
+            bool: True if the game is idle
+        '''
+
+        return self.gameplay.current_player_index == 0 and \
+            not self.gameplay.is_fight_pending() and \
+            not self.gameplay.is_skipping_fights and \
+            self.last_mouse_pos is None and \
+            self.last_mouse_pos_for_sliders is None
+
+    def __wait_for_events(self):
+        '''
+        Sleeps until an event comes or until idle timeout
+
+        Returns:
+            list(pygame.event): events, empty after timeout
+        '''
+
+        event = pygame.event.wait(self.idle_timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+
+        return [event] + pygame.event.get()
+
+    def __is_redraw_needed(self, events):
+        '''
+        Returns True if any of events can change the screen, mouse motion
+        without pressed button doesn't
+
+        Args:
+            events (list(pygame.event)): handled events
+
+        Returns:
+            bool: True if frame has to be drawn
+        '''
+
+        return any(event.type != pygame.MOUSEMOTION for event in events) \
+            or not self.is_idle()
+
+    def get_fps(self):
+        '''
+        Returns measured frames per second, averaged over the last frames
+
+        Returns:
+            float: frames per second
+        '''
+
+        return self.clock.get_fps()
+
+    def get_cpu_time_per_frame(self):
+        '''
+        Returns average CPU time of the last frames, time of sleeping
+        between frames isn't included
 
-    def handle_events(self):
+        Returns:
+            float: CPU time per frame in ms
         '''
-        Handles all events
+
+        if not self.frame_cpu_times:
+            return 0.0
+
+        return 1000 * sum(self.frame_cpu_times) / len(self.frame_cpu_times)
+
+
+    def handle_events(self, events=None):
         '''
+        Handles all events. Moving of map, zooming and moving of slider
+        are accumulated and applied once for all events
+
+        Args:
+            events (list(pygame.event)): events to handle, all events
+                from the queue if None
+        '''
+
+        if events is None:
+            events = pygame.event.get()
 
-        for event in pygame.event.get():
+        for event in events:
             self.__check_event_game_close(event)
 
+            self.__check_event_window(event)
+
             self.__check_event_mouse(event)
 
+            self.__check_event_skip_fights(event)
+
             self.__check_event_human_turn(event)
 
+        self.__apply_map_input()
+        self.__apply_slider_input()
+
+    def __apply_map_input(self):
+        '''
+        Moves and zooms map by input accumulated since it was applied
+        '''
+
+        if self.map_shift != [0, 0]:
+            self.map_.move_polygons(self.map_shift)
+            self.map_shift = [0, 0]
+
+        if self.zoom_steps:
+            self.map_.resize_polygons(min(max(
+                self.map_.side_length + 2 * self.zoom_steps,
+                map.MIN_SIDE_LENGTH), map.MAX_SIDE_LENGTH))
+            self.zoom_steps = 0
+
+    def __apply_slider_input(self):
+        '''
+        Moves targeted slider by input accumulated since it was applied
+        '''
+
+        if self.slider_shift != [0, 0] and self.slider_targeted:
+            self.slider_targeted.move_slider(self.slider_shift)
+        self.slider_shift = [0, 0]
 
     def __check_event_game_close(self, event):
         '''
@@ -68,6 +223,19 @@ class EventHandler:
             if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                 sys.exit(0)
 
+    def __check_event_window(self, event):
+        '''
+        Checks if window was covered or lost focus and its content has to
+        be drawn whole again
+
+        Args:
+            event (pygame.event): event
+        '''
+
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                          pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED):
+            self.graphics.invalidate()
+
     def __check_event_mouse(self, event):
         '''
         Checks user input from mouse
@@ -91,26 +259,27 @@ class EventHandler:
         if event.type == pygame.MOUSEBUTTONDOWN:
             # LMB
             if event.button == 1:
+                mouse_pos = self.graphics.get_mouse_pos()
                 for slider in self.graphics.sliders:
-                    if slider.is_point_in_rect(pygame.mouse.get_pos()):
-                        self.last_mouse_pos_for_sliders = \
-                            pygame.mouse.get_pos()
+                    if slider.is_point_in_rect(mouse_pos):
+                        self.last_mouse_pos_for_sliders = mouse_pos
                         self.slider_targeted = slider
                         break
                 else:
                     if self.graphics.button_new_map.is_point_in_rect(
-                     pygame.mouse.get_pos()):
+                     mouse_pos):
                             self.graphics.set_options_for_new_map()
+                            self.gameplay.reset_turn()
                             self.map_.create_map()
             # RMB
             elif event.button == 3:
-                self.last_mouse_pos = pygame.mouse.get_pos()
+                self.last_mouse_pos = self.graphics.get_mouse_pos()
             # Scroll up
             elif event.button == 4:
-                self.map_.resize_polygons(self.map_.side_length + 2)
+                self.zoom_steps += 1
             # Scroll down
             elif event.button == 5:
-                self.map_.resize_polygons(self.map_.side_length - 2)
+                self.zoom_steps -= 1
 
     def __check_event_mouse_motion(self, event):
         '''
@@ -124,18 +293,18 @@ class EventHandler:
         # last_mouse_pos or last_mouse_pos_for_slider is not None
         if event.type == pygame.MOUSEMOTION:
             if self.last_mouse_pos:
-                current_pos = pygame.mouse.get_pos()
-                shift = [item1 - item2 for item1,
-                         item2 in zip(current_pos, self.last_mouse_pos)]
+                current_pos = self.graphics.get_mouse_pos()
+                self.map_shift = [
+                    shift + item1 - item2 for shift, item1, item2 in
+                    zip(self.map_shift, current_pos, self.last_mouse_pos)]
                 self.last_mouse_pos = current_pos
-                self.map_.move_polygons(shift)
             elif self.last_mouse_pos_for_sliders:
-                current_pos = pygame.mouse.get_pos()
-                shift = [item1 - item2 for item1,
-                         item2 in zip(current_pos,
-                                      self.last_mouse_pos_for_sliders)]
+                current_pos = self.graphics.get_mouse_pos()
+                self.slider_shift = [
+                    shift + item1 - item2 for shift, item1, item2 in
+                    zip(self.slider_shift, current_pos,
+                        self.last_mouse_pos_for_sliders)]
                 self.last_mouse_pos_for_sliders = current_pos
-                self.slider_targeted.move_slider(shift)
 
     def __check_event_mouse_button_up(self, event):
         '''
@@ -148,21 +317,35 @@ class EventHandler:
         if event.type == pygame.MOUSEBUTTONUP:
             # LMB
             if event.button == 1:
+                self.__apply_slider_input()
                 self.last_mouse_pos_for_sliders = None
                 self.slider_targeted = None
             # RMB
             elif event.button == 3:
                 self.last_mouse_pos = None
 
+    def __check_event_skip_fights(self, event):
+        '''
+        Checks if user wants to skip waiting for fights
+
+        Args:
+            event (pygame.event): event
+        '''
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+            self.gameplay.skip_fights()
+
     def __check_event_human_turn(self, event):
         '''
-        Checks if current player is human and handles input
+        Checks if current player is human and handles input. Input is
+        ignored while result of a fight is displayed
 
         Args:
             event (pygame.event): event
         '''
 
-        if self.gameplay.current_player_index == 0:
+        if self.gameplay.current_player_index == 0 and \
+           not self.gameplay.is_fight_pending():
             self.__check_event_human_turn_keydown(event)
             self.__check_event_human_turn_mouse_button_down(event)
 
@@ -178,6 +361,7 @@ class EventHandler:
             if event.key == pygame.K_SPACE:
                 self.gameplay.turn()
             elif event.key == pygame.K_a:
+                self.gameplay.reset_turn()
                 self.map_.create_map()
 
     def __check_event_human_turn_mouse_button_down(self, event):
@@ -192,26 +376,26 @@ class EventHandler:
         if event.type == pygame.MOUSEBUTTONDOWN:
             # LMB
             if event.button == 1:
-                for hex_ in list(self.map_.hex_map.flat):
-                    if type(hex_) == map.Hex:
-                        if hex_.is_point_inside_polygon(
-                           pygame.mouse.get_pos()):
-                            if hex_.player == self.map_.players[0] and \
-                               hex_.dice_number > 1:
-                                self.gameplay.attacking_hex = hex_
-                            elif type(hex_.player) != \
-                                self.map_.players[0] and \
-                                self.gameplay.attacking_hex and \
-                                    self.gameplay.is_hex_next_to_attacking_hex(
-                                        hex_):
-                                self.gameplay.defending_hex = hex_
+                # Hex is picked on the map as it's shown after moving
+                self.__apply_map_input()
+                hex_ = self.map_.pick_hex(self.graphics.get_mouse_pos())
+                if hex_:
+                    if hex_.player == self.map_.players[0] and \
+                       hex_.dice_number > 1:
+                        self.gameplay.attacking_hex = hex_
+                    elif hex_.player != self.map_.players[0] and \
+                        self.gameplay.attacking_hex and \
+                            self.gameplay.is_hex_next_to_attacking_hex(hex_):
+                        self.gameplay.defending_hex = hex_
 
     def tick(self):
         '''
         Handles everything that happens in main game loop besides user
-        input
+        input. Nothing here waits, pending fight is finished in one of
+        the next ticks when its time passes
         '''
 
+        self.gameplay.play_skipped_fights(SKIPPED_FIGHTS_TIME_LIMIT)
         self.gameplay.handle_ai()
         self.graphics.render()
         self.graphics.read_sliders_values()
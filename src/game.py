@@ -1,9 +1,10 @@
-import math
-import random
 import time
 import numpy
 
-import map
+import dice
+import distribution
+import odds
+import regions
 
 
 class Player:
@@ -26,7 +27,7 @@ class Gameplay:
     '''
 
     def __init__(self, map_, die_sides_number, fight_time, 
-                 max_dice_on_single_hex):
+                 max_dice_on_single_hex, regions_engine='index', seed=None):
         '''
         Initializes Gameplay object
 
@@ -39,12 +40,28 @@ class Gameplay:
 
             max_dice_on_single_hex (int): maximum ammount of dice 
                 on a single hex
+
+            regions_engine (string): how connected regions are counted,
+                'index' reads map's incrementally updated region index,
+                'labelling' labels regions of all players in one pass
+
+            seed (int): seed of gameplay's random numbers generator, random
+                if None
         '''
 
+        if regions_engine not in ('index', 'labelling'):
+            raise Exception('regions_engine isn\'t index or labelling')
+
         self.map_ = map_
         self.die_sides_number = die_sides_number
         self.fight_time = fight_time
         self.max_dice_on_single_hex = max_dice_on_single_hex
+        self.regions_engine = regions_engine
+        # Labelled sizes of the largest regions and map's owners version
+        # they were computed for
+        self.largest_region_sizes = (None, None)
+
+        self.rng = numpy.random.default_rng(seed)
 
         self.is_enemy_playing = False
 
@@ -52,6 +69,9 @@ class Gameplay:
         self.defending_hex = None
 
         self.fight_finished = False
+        # Monotonic time when result of rolled fight stops being displayed
+        self.fight_end_time = 0.0
+        self.is_skipping_fights = False
 
         self.attacking_hex_power = 0
         self.defending_hex_power = 0
@@ -66,6 +86,7 @@ class Gameplay:
         Adds dice to human player's hexes and run ai script
         '''
 
+        self.is_skipping_fights = False
         self.add_dice(self.map_.players[0])
         self.current_player_index = 1
         self.prepare_enemy_ai()
@@ -76,6 +97,7 @@ class Gameplay:
         '''
 
         self.current_player_index = 0
+        self.is_skipping_fights = False
 
     def finish_single_ai_turn(self):
         '''
@@ -99,33 +121,12 @@ class Gameplay:
             list(Hex): list of neighbours
         '''
 
-        neighbours = []
-
-        if hex_coords[0] > 0:
-            neighbours.append(self.map_.hex_map[hex_coords[0] - 1,
-                              hex_coords[1]])
-            if hex_coords[1] < self.map_.size[1] - 1:
-                neighbours.append(self.map_.hex_map[hex_coords[0] - 1,
-                                  hex_coords[1] + 1])
+        index = hex_coords[0] * self.map_.shape[1] + hex_coords[1]
+        neighbours = self.map_.get_neighbour_indices(index)
+        neighbours = neighbours[self.map_.owners.ravel()[neighbours] !=
+                                self.current_player_index]
 
-        if hex_coords[0] < self.map_.size[0] - 1:
-            neighbours.append(self.map_.hex_map[hex_coords[0] + 1,
-                              hex_coords[1]])
-            if hex_coords[1] > 0:
-                neighbours.append(self.map_.hex_map[hex_coords[0] + 1,
-                                  hex_coords[1] - 1])
-
-        if hex_coords[1] > 0:
-            neighbours.append(self.map_.hex_map[hex_coords[0],
-                              hex_coords[1] - 1])
-
-        if hex_coords[1] < self.map_.size[1] - 1:
-            neighbours.append(self.map_.hex_map[hex_coords[0],
-                              hex_coords[1] + 1])
-
-        neighbours = [hex_ for hex_ in neighbours if type(hex_) == map.Hex]
-        return [hex_ for hex_ in neighbours if hex_.player !=
-                self.map_.players[self.current_player_index]]
+        return [self.map_.get_hex_by_index(index) for index in neighbours]
 
 
     def __ai_select_best_target(self, dice_number, neighbours):
@@ -157,7 +158,7 @@ class Gameplay:
             neighbours (list(Hex)): list of neighbour hexes
         '''
 
-        self.defending_hex = neighbours[random.randrange(len(neighbours))]
+        self.defending_hex = neighbours[self.rng.integers(len(neighbours))]
         self.fight()
 
 
@@ -166,7 +167,7 @@ class Gameplay:
         Handles single enemy ai
         '''
 
-        if self.current_player_index > 0:
+        if self.current_player_index > 0 and not self.fight_finished:
             if self.ai_coords_and_hexes_list:
                 self.enemy_ai(self.ai_coords_and_hexes_list[0])
                 self.ai_coords_and_hexes_list.pop(0)
@@ -183,11 +184,11 @@ class Gameplay:
         Creates list of all of single player hexes and their coords
         '''
 
-        for coords, hex_ in numpy.ndenumerate(self.map_.hex_map):
-            if type(hex_) == map.Hex:
-                if hex_.player == self.map_.players[self.current_player_index]:
-                    if hex_.dice_number > 1:
-                        self.ai_coords_and_hexes_list.append((coords, hex_))                
+        is_ready = (self.map_.owners == self.current_player_index) & \
+            (self.map_.dice > 1)
+
+        for hex_ in self.map_.get_hex_list(is_ready):
+            self.ai_coords_and_hexes_list.append((hex_.coords, hex_))
 
 
     def enemy_ai(self, coords_and_hex):
@@ -215,9 +216,14 @@ class Gameplay:
             player (Player): Player object
         '''
 
-        hex_list = [
-            hex_ for hex_ in self.map_.hex_map.flat if type(hex_) == map.Hex]
-        hex_list = [hex_ for hex_ in hex_list if hex_.player == player]
+        player_index = self.map_.get_player_index(player)
+        dice_on_hexes = self.map_.dice.ravel()
+        hex_indices = numpy.flatnonzero(self.map_.owners == player_index)
+
+        # Free capacity of every player's hex
+        capacity = numpy.maximum(
+            self.max_dice_on_single_hex -
+            dice_on_hexes[hex_indices].astype(numpy.int64), 0)
 
         # Dice is a number of connected hexes. For example you can have two 
         # groups of 10 and 5 connected hexes. Dice will be 10, because
@@ -226,10 +232,7 @@ class Gameplay:
         # dice_to_add is dice + ammount of dice that player has in stock
         dice_to_add = dice + player.additional_dice
 
-        max_dice_on_single_hex_to_add = 0
-        for hex_ in hex_list:
-            max_dice_on_single_hex_to_add += (
-                self.max_dice_on_single_hex - hex_.dice_number)
+        max_dice_on_single_hex_to_add = int(capacity.sum())
 
         # Dice on single field cannot exceed max_dice_on_single_hex
         # Leftovers are stored in player.additional_dice
@@ -243,12 +246,10 @@ class Gameplay:
         if dice_to_add > max_dice_on_single_hex_to_add:
             dice_to_add = max_dice_on_single_hex_to_add
 
-        for die in range(dice_to_add):
-            while True:
-                hex_ = hex_list[random.randrange(len(hex_list))]
-                if hex_.dice_number < self.max_dice_on_single_hex:
-                    hex_.dice_number += 1
-                    break
+        # All dice are drawn at once, every free place for a die has
+        # the same chance to get it
+        dice_on_hexes[hex_indices] += distribution.bounded_multinomial(
+            dice_to_add, capacity, self.rng).astype(numpy.uint8)
 
 
     def __count_connected_hexes(self, player):
@@ -264,110 +265,87 @@ class Gameplay:
             (int): ammount of connected hexes
         '''
 
-        hex_map = numpy.copy(self.map_.hex_map)
-        hex_and_coords_list = []
-        count_ = 0
-        max_ = 0
+        player_index = self.map_.get_player_index(player)
 
-        for coords, hex_ in numpy.ndenumerate(hex_map):
-            if type(hex_) == map.Hex:
-                if hex_.player == player:
-                    hex_and_coords_list.append([hex_, coords])
+        if self.regions_engine == 'labelling':
+            return int(self.get_largest_region_sizes()[player_index])
 
-                    for hex_in_list in hex_and_coords_list:
-                        coords = hex_in_list[1]
+        return self.map_.regions.get_largest_region_size(player_index)
 
-                        for dir_ in range(6):
-                            new_coords = self.__move_hex_coords(coords, dir_)
-                            hex_connected = self.__get_connected_hex(
-                                player, new_coords)
+    def get_largest_region_sizes(self):
+        '''
+        Returns number of connected hexes in the largest group of every
+        player, so all players can share one computation. Labelled sizes
+        are cached until owners of hexes change
 
-                            if hex_connected and \
-                                [hex_connected, new_coords] not in \
-                                    hex_and_coords_list:
-                                hex_and_coords_list.append(
-                                    [hex_connected, new_coords])
-                                hex_map[
-                                    self.__move_hex_coords(coords, dir_)] = 0
+        Returns:
+            numpy.ndarray: ammount of connected hexes for every player
+        '''
 
-                    count_ = len(hex_and_coords_list)
-                    if max_ < count_:
-                        max_ = count_
+        if self.regions_engine == 'labelling':
+            owners_version = self.map_.owners_version
+            if self.largest_region_sizes[0] != owners_version:
+                self.largest_region_sizes = (
+                    owners_version, regions.get_largest_region_sizes(
+                        self.map_.owners, self.map_.neighbours,
+                        len(self.map_.players)))
 
-                    hex_and_coords_list = []
+            return self.largest_region_sizes[1]
 
-        return max_
+        return numpy.array([
+            self.map_.regions.get_largest_region_size(player_index)
+            for player_index in range(len(self.map_.players))])
 
 
-    def __move_hex_coords(self, hex_coords, direction):
+    def is_fight_pending(self):
         '''
-        Returns hex's coords moved to given direction. 
-        Direction 0 means top left side and it goes clockwise
-
-        Args:
-            hex_coords (int, int): hex's coords given as 2d array index
-
-            direction (int): direction (0 .. 5)
+        Returns True if fight is rolled and its result is displayed
 
         Returns:
-            (int, int): hex's coord given as 2d array index moved
-        '''
-
-        hex_coords_moved = list(hex_coords)
-        if direction == 0:
-            if hex_coords[0] > 0:
-                hex_coords_moved[0] -= 1
-        elif direction == 1:
-            if hex_coords[0] > 0 and hex_coords[1] < self.map_.size[1] - 1:
-                hex_coords_moved[0] -= 1
-                hex_coords_moved[1] += 1
-        elif direction == 2:
-            if hex_coords[0] < self.map_.size[0] - 1:
-                hex_coords_moved[0] += 1
-        elif direction == 3:
-            if hex_coords[0] < self.map_.size[0] - 1 and hex_coords[1] > 0:
-                hex_coords_moved[0] += 1
-                hex_coords_moved[1] -= 1
-        elif direction == 4:
-            if hex_coords[1] > 0:
-                hex_coords_moved[1] -= 1
-        elif direction == 5:
-            if hex_coords[1] < self.map_.size[1] - 1:
-                hex_coords_moved[1] += 1
-
-        return tuple(hex_coords_moved)
-
-
-    def __get_connected_hex(self, player, hex_coords):
-        '''
-        Returns hex if it's owner is given player, else returns None
-
-        Args:
-            player (Player): Player object
+            bool: True if fight is waiting for fight_finish
+        '''
 
-            hex_coords (int, int): hex's coords given as 2d array index
+        return self.fight_finished
 
-        Returns:
-            Hex or None: hex with given coords
+    def skip_fights(self):
+        '''
+        Finishes pending fight without waiting. During enemies' turns
+        all their fights are finished without waiting until human's turn.
+        It does nothing on human's turn without pending fight
         '''
 
-        hex_ = self.map_.hex_map[hex_coords]
+        if self.fight_finished or self.current_player_index > 0:
+            self.is_skipping_fights = True
 
-        if type(hex_) == map.Hex:
-            if hex_.player == player:
-                return hex_
+    def play_skipped_fights(self, time_limit):
+        '''
+        Plays enemies' fights one after another without waiting while
+        fights are skipped, so the main loop isn't blocked for longer than
+        time_limit
 
-        return None
+        Args:
+            time_limit (float): maximum time of playing in seconds
+        '''
+
+        end_time = time.monotonic() + time_limit
 
+        while self.is_skipping_fights and self.current_player_index > 0 \
+                and time.monotonic() < end_time:
+            self.handle_ai()
+            self.fight_finish()
 
     def fight_finish(self):
         '''
-        Checks if fight is finished, does a break and prepares for the next fight
+        Checks if fight is finished and its result was displayed for
+        fight time, then moves dice and prepares for the next fight.
+        It doesn't wait, it's called again every frame until fight time
+        passes
         '''
 
         if self.fight_finished:
-            if self.fight_time > 0:
-                time.sleep(self.fight_time / 1000)
+            if self.fight_time > 0 and not self.is_skipping_fights and \
+                    time.monotonic() < self.fight_end_time:
+                return
 
             # If attacking player has won the fight conquer defending hex
             # Leaving one dice behind and move dice to conquered hex
@@ -380,29 +358,98 @@ class Gameplay:
             else:
                 self.attacking_hex.dice_number = 1
 
-            self.attacking_hex = None
-            self.defending_hex = None
-            self.attacking_hex_power = 0
-            self.defending_hex_power = 0
+            self.cancel_fight()
 
-            self.fight_finished = False
+    def cancel_fight(self):
+        '''
+        Forgets selected hexes and pending fight without moving any dice
+        '''
 
+        self.attacking_hex = None
+        self.defending_hex = None
+        self.attacking_hex_power = 0
+        self.defending_hex_power = 0
 
-    def fight(self):
+        self.fight_finished = False
+
+        # Human skips only his own fight
+        if self.current_player_index == 0:
+            self.is_skipping_fights = False
+
+    def reset_turn(self):
         '''
-        Rolls dice for attacking and defending hex and finishes fight
+        Cancels pending fight and enemies' turn, so human plays next. It's
+        used when a new map is created, nothing refers to the old board
         '''
 
-        if self.attacking_hex and self.defending_hex:
-            for die in range(self.attacking_hex.dice_number):
-                self.attacking_hex_power += random.randrange(
-                    1, self.die_sides_number + 1)
+        self.cancel_fight()
+
+        self.ai_coords_and_hexes_list = []
+        self.current_player_index = 0
+        self.is_skipping_fights = False
+
 
-            for die in range(self.defending_hex.dice_number):
-                self.defending_hex_power += random.randrange(
-                    1, self.die_sides_number + 1)
+    def fight(self):
+        '''
+        Rolls dice for attacking and defending hex, result is displayed
+        for fight time and then fight_finish finishes it
+        '''
+
+        if self.attacking_hex and self.defending_hex and \
+                not self.fight_finished:
+            self.attacking_hex_power, self.defending_hex_power = \
+                dice.roll_fight(self.rng, self.attacking_hex.dice_number,
+                                self.defending_hex.dice_number,
+                                self.die_sides_number)
 
             self.fight_finished = True
+            self.fight_end_time = time.monotonic() + self.fight_time / 1000
+
+
+    def get_hex_numbers(self):
+        '''
+        Returns ammount of hexes owned by every player
+
+        Returns:
+            numpy.ndarray: ammount of hexes for every player
+        '''
+
+        return numpy.bincount(self.map_.owners[self.map_.occupied],
+                              minlength=len(self.map_.players))
+
+    def get_winner(self):
+        '''
+        Returns index of player who conquered all hexes, the game is over
+        then. Otherwise returns None
+
+        Returns:
+            int or None: winner's index in players list
+        '''
+
+        players_with_hexes = numpy.flatnonzero(self.get_hex_numbers())
+        if len(players_with_hexes) == 1:
+            return int(players_with_hexes[0])
+
+        return None
+
+
+    def get_attack_win_probability(self, attacking_hex, defending_hex):
+        '''
+        Returns exact probability that attacking hex wins a fight with
+        defending hex, it's a lookup in memoized table
+
+        Args:
+            attacking_hex (Hex): attacking hex
+
+            defending_hex (Hex): defending hex
+
+        Returns:
+            float: probability that attacking hex wins
+        '''
+
+        return odds.get_win_probability(
+            attacking_hex.dice_number, defending_hex.dice_number,
+            self.die_sides_number, self.max_dice_on_single_hex)
 
 
     def is_hex_next_to_attacking_hex(self, hex_):
@@ -416,15 +463,4 @@ class Gameplay:
             True if attacking hex is neighbour with hex_
         '''
 
-        max_distance_between_two_neighbour_hexes = math.sqrt(
-            self.map_.half_side_length_root3 ** 2 +
-            (self.map_.side_length + self.map_.half_side_length) ** 2)
-
-        distance = math.sqrt((
-            self.attacking_hex.middle[0] - hex_.middle[0]) ** 2 +
-            (self.attacking_hex.middle[1] - hex_.middle[1]) ** 2)
-
-        if distance > max_distance_between_two_neighbour_hexes:
-            return False
-
-        return True
+        return self.map_.are_neighbours(self.attacking_hex.index, hex_.index)
@@ -0,0 +1,80 @@
+import collections
+import pygame
+
+
+class GlyphCache:
+    '''
+    Cache of rendered texts. Every text is rendered once for given size and
+    color and kept as converted surface, the least recently used ones are
+    dropped when cache is full. Only one font object is created per size
+    '''
+
+    def __init__(self, font_name, bold=False, max_glyphs=4096):
+        '''
+        Initializes GlyphCache object
+
+        Args:
+            font_name (string): name of system font
+
+            bold (bool): True if font is bold
+
+            max_glyphs (int): maximum ammount of cached texts, shared by
+                all sizes
+        '''
+
+        self.font_name = font_name
+        self.bold = bold
+        self.max_glyphs = max_glyphs
+
+        self.fonts = {}
+        self.glyphs = collections.OrderedDict()
+
+    def get_font(self, size):
+        '''
+        Returns font of given size, it's created on first use
+
+        Args:
+            size (int): font's size
+
+        Returns:
+            pygame.font.Font: font
+        '''
+
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.SysFont(self.font_name, size, self.bold)
+            self.fonts[size] = font
+
+        return font
+
+    def render(self, size, text, color):
+        '''
+        Returns surface with rendered antialiased text
+
+        Args:
+            size (int): font's size
+
+            text (string): text to render
+
+            color (int, int, int): text's color
+
+        Returns:
+            pygame.Surface: rendered text
+        '''
+
+        key = (size, text, color)
+
+        glyph = self.glyphs.get(key)
+        if glyph is not None:
+            self.glyphs.move_to_end(key)
+            return glyph
+
+        glyph = self.get_font(size).render(text, True, color)
+        if pygame.display.get_surface():
+            glyph = glyph.convert_alpha()
+
+        self.glyphs[key] = glyph
+        if len(self.glyphs) > self.max_glyphs:
+            self.glyphs.popitem(last=False)
+
+        return glyph
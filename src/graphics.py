@@ -1,9 +1,24 @@
 import ctypes
+import math
+import numpy
 import pygame
 import random
 
 import controls
 import game
+import glyphs
+import tiles
+
+
+# If more hexes than this part of visible hexes changed, whole screen is
+# drawn again instead of single hexes
+MAX_DIRTY_HEXES_PART = 0.25
+# Board is cached in square tiles of this size in pixels
+TILE_SIZE = 256
+# Maximum ammount of pixels of all cached tiles (64MB with 32 bit color)
+TILE_CACHE_MAX_PIXELS = 16 * 1024 * 1024
+# Color of hex sprites' background, it isn't used by players
+HEX_SPRITE_COLORKEY = (255, 0, 255)
 
 
 class NewGameOptions:
@@ -17,7 +32,9 @@ class NewGameOptions:
 
 
 class Graphics:
-    def __init__(self, map_, gameplay, window_size):
+    def __init__(self, map_, gameplay, window_size,
+                 dice_number_min_side_length=14,
+                 hex_sprites_max_side_length=20, display_size=None):
         '''
         Initializes graphics object
 
@@ -26,17 +43,43 @@ class Graphics:
 
             gameplay (Gameplay): gameplay object
 
-            window_size (int, int): window size
+            window_size (int, int): size of the surface where everything
+                is drawn
+
+            dice_number_min_side_length (int): dice numbers aren't drawn
+                on hexes with shorter side
+
+            hex_sprites_max_side_length (int): hexes with this or shorter
+                side are blitted from pre-rendered sprites instead of
+                drawing polygons, sprites have the same pixels as polygons
+
+            display_size (int, int): size of the display, if it differs
+                from window size everything is drawn at window size and
+                scaled to the display. The same as window size if None
         '''
 
-        # This is needed for mouse cursor to send proper position
-        ctypes.windll.user32.SetProcessDPIAware()
+        # This is needed for mouse cursor to send proper position,
+        # it exists only on Windows
+        if hasattr(ctypes, 'windll'):
+            ctypes.windll.user32.SetProcessDPIAware()
 
         self.map_ = map_
         self.gameplay = gameplay
         self.window_size = window_size
-        self.surface = pygame.display.set_mode(self.window_size,
+        self.display_size = display_size or window_size
+        self.dice_number_min_side_length = dice_number_min_side_length
+        self.hex_sprites_max_side_length = hex_sprites_max_side_length
+        self.display = pygame.display.set_mode(self.display_size,
                                                pygame.FULLSCREEN)
+        self.display_size = self.display.get_size()
+
+        # Scaling display's pixels to surface's pixels
+        self.display_scale = (self.display_size[0] / self.window_size[0],
+                              self.display_size[1] / self.window_size[1])
+        if self.display_size == self.window_size:
+            self.surface = self.display
+        else:
+            self.surface = pygame.Surface(self.window_size, 0, self.display)
 
         self.new_game_options = NewGameOptions(
                                     self.map_.size,
@@ -48,6 +91,21 @@ class Graphics:
         self.__init_fonts()
         self.__init_right_bar()
 
+        # State shown on screen, it's compared with current state to find
+        # regions which have to be drawn again
+        self.rendered_view = None
+        self.rendered_owners = None
+        self.rendered_dice = None
+        self.rendered_attacking_hex_index = None
+        self.rendered_right_bar_hexes = None
+
+        # Board drawn at current zoom in tiles, panning blits visible
+        # tiles with camera's offset. Changed hexes are patched into them
+        self.tiles = tiles.TileCache(TILE_SIZE, TILE_CACHE_MAX_PIXELS,
+                                     self.__draw_tile, self.surface)
+        self.tiles_key = None
+        self.rendered_side_length = None
+
     def __init_fonts(self):
         '''
         Initializes fonts
@@ -60,6 +118,13 @@ class Graphics:
                             bold=1)
         self.font_sliders = pygame.font.SysFont('arial', 18, bold=1)
 
+        # Dice numbers of hexes, their size changes with zoom
+        self.dice_number_glyphs = glyphs.GlyphCache('timesnewroman', True)
+
+        # Hex of every color drawn at current side length
+        self.hex_sprites = {}
+        self.hex_sprites_side_length = None
+
     def __init_right_bar(self):
         '''
         Initializes right side bar and controls on it
@@ -72,25 +137,42 @@ class Graphics:
             self.window_size[0] - (self.right_bar_units[0] * 8),
             0, self.right_bar_units[0] * 8, self.window_size[1])
 
+        # Part of the screen where hexes are drawn, without right bar
+        self.map_rect = pygame.Rect(0, 0, self.right_bar_rect[0],
+                                    self.window_size[1])
+
+        # Right bar is drawn on its own surface placed at this position,
+        # only its changed parts are drawn again
+        self.right_bar_position = (int(self.right_bar_rect[0]),
+                                   int(self.right_bar_rect[1]))
+        self.right_bar_surface = None
+
+        # Part of right bar above sliders with chosen hexes and their power
+        # in right bar's space
+        self.right_bar_hexes_rect = pygame.Rect(
+            0, 0, self.right_bar_rect[2], self.right_bar_units[1] * 9)
+
         self.__init_hex_right_bar_representation()
         self.__init_controls()
 
     def __init_hex_right_bar_representation(self):
         '''
-        Initializes chosen hex visual representation
+        Initializes chosen hex visual representation in right bar's space
         '''
 
         self.attacking_hex_representation_middle = (
             self.window_size[0] - self.right_bar_rect[2] +
-            self.right_bar_units[0], self.right_bar_units[1] * 2)
+            self.right_bar_units[0] - self.right_bar_position[0],
+            self.right_bar_units[1] * 2 - self.right_bar_position[1])
 
         self.attacking_hex_representation_polygon = \
             self.map_.calculate_hex_polygon(
                 self.attacking_hex_representation_middle)
 
         self.defending_hex_representation_middle = (
-            self.window_size[0] - self.right_bar_units[0],
-            self.right_bar_units[1] * 2)
+            self.window_size[0] - self.right_bar_units[0] -
+            self.right_bar_position[0],
+            self.right_bar_units[1] * 2 - self.right_bar_position[1])
 
         self.defending_hex_representation_polygon = \
             self.map_.calculate_hex_polygon(
@@ -268,7 +350,7 @@ class Graphics:
         Reads values from new game options and sets options for new map
         '''
 
-        self.map_.size = self.new_game_options.map_size
+        self.map_.size = list(self.new_game_options.map_size)
 
         map_area = self.map_.size[0] * self.map_.size[1]
         self.map_.hex_number = int(
@@ -308,59 +390,670 @@ class Graphics:
 
     def render(self):
         '''
-        Rendering
+        Rendering. Whole screen is drawn after pan, zoom, creating a new
+        map or losing display's content, otherwise only regions which
+        changed since the last frame are drawn and updated on display
         '''
-        
-        self.surface.fill((0, 0, 0))
 
-        self.__draw_visible_hexes()
+        changed_indices = self.__get_changed_hex_indices()
+        right_bar_rects = self.__update_right_bar()
+
+        if self.__update_tiles(changed_indices) or \
+           self.rendered_view != self.__get_view():
+            self.__render_full()
+        else:
+            self.__render_dirty(changed_indices, right_bar_rects)
 
-        self.__draw_right_bar_hexes()
+        self.__save_rendered_state()
 
-        self.__draw_right_bar_hexes_power()
+    def __get_view(self):
+        '''
+        Returns state which requires drawing the whole screen when it
+        changes: camera, map's layout and players
+
+        Returns:
+            tuple: view's state
+        '''
+
+        return (self.map_.camera.version, self.map_.layout_version,
+                id(self.map_.players))
+
+    def __render_full(self):
+        '''
+        Draws the whole screen
+        '''
 
-        self.__draw_controls()
+        self.surface.fill((0, 0, 0))
+
+        if self.tiles_key:
+            self.__blit_tiles(self.map_rect)
+        else:
+            self.__draw_visible_hexes()
+
+        self.surface.blit(self.right_bar_surface, self.right_bar_position)
+
+        if self.surface is not self.display:
+            pygame.transform.scale(self.surface, self.display_size,
+                                   self.display)
 
         pygame.display.flip()
 
+    def __is_display_scale_integer(self):
+        '''
+        Returns True if every pixel of surface is scaled to the same
+        ammount of display's pixels, then parts of surface can be scaled
+        separately with the same result as scaling the whole surface
+
+        Returns:
+            bool: True if display's scale is integer
+        '''
+
+        return all(display_size % window_size == 0 for display_size,
+                   window_size in zip(self.display_size, self.window_size))
+
+    def __render_dirty(self, changed_indices, right_bar_rects):
+        '''
+        Draws changed hexes, copies changed parts of right bar and updates
+        only their rectangles on display
+
+        Args:
+            changed_indices (numpy.ndarray): flat indices of changed hexes
+
+            right_bar_rects (list(pygame.Rect)): changed rectangles of
+                right bar in its space
+        '''
+
+        # Only changed hexes on screen are drawn
+        hex_rects = self.__get_hex_rects(
+            changed_indices, self.map_.camera.offset, self.map_rect)
+
+        if len(hex_rects) > MAX_DIRTY_HEXES_PART * len(
+                self.map_.get_visible_indices(self.right_bar_rect)):
+            self.__render_full()
+            return
+
+        if self.tiles_key:
+            dirty_rects = self.__copy_changed_hexes_from_tiles(hex_rects)
+        else:
+            dirty_rects = self.__draw_changed_hexes(
+                self.surface, hex_rects, self.map_.camera.offset)
+
+        for rect in right_bar_rects:
+            screen_rect = rect.move(self.right_bar_position)
+            self.surface.blit(self.right_bar_surface, screen_rect, rect)
+            dirty_rects.append(screen_rect)
+
+        if dirty_rects:
+            pygame.display.update(self.__scale_to_display(dirty_rects))
+
+    def __scale_to_display(self, rects):
+        '''
+        Scales changed rectangles of surface to the display. With integer
+        scale only they are scaled, otherwise the whole surface is scaled
+        in one call and only changed rectangles of the display are updated
+
+        Args:
+            rects (list(pygame.Rect)): changed rectangles of surface
+
+        Returns:
+            list(pygame.Rect): changed rectangles of the display
+        '''
+
+        if self.surface is self.display:
+            return rects
+
+        if not self.__is_display_scale_integer():
+            pygame.transform.scale(self.surface, self.display_size,
+                                   self.display)
+
+        display_bounds = self.display.get_rect()
+        display_rects = []
+        for rect in rects:
+            rect = rect.clip(self.surface.get_rect())
+            left = math.floor(rect.left * self.display_scale[0])
+            top = math.floor(rect.top * self.display_scale[1])
+            display_rect = pygame.Rect(
+                left, top,
+                math.ceil(rect.right * self.display_scale[0]) - left,
+                math.ceil(rect.bottom * self.display_scale[1]) - top).clip(
+                    display_bounds)
+
+            if not rect.width or not rect.height or \
+               not display_rect.width or not display_rect.height:
+                continue
+
+            if self.__is_display_scale_integer():
+                pygame.transform.scale(self.surface.subsurface(rect),
+                                       display_rect.size,
+                                       self.display.subsurface(display_rect))
+            display_rects.append(display_rect)
+
+        return display_rects
+
+    def to_surface_point(self, point):
+        '''
+        Maps point on the display to surface where everything is drawn
+
+        Args:
+            point (int, int): point on the display, mostly mouse position
+
+        Returns:
+            (int, int): point on surface
+        '''
+
+        return (int(point[0] / self.display_scale[0]),
+                int(point[1] / self.display_scale[1]))
+
+    def get_mouse_pos(self):
+        '''
+        Returns mouse position on surface where everything is drawn
+
+        Returns:
+            (int, int): mouse position
+        '''
+
+        return self.to_surface_point(pygame.mouse.get_pos())
+
+    def __update_right_bar(self):
+        '''
+        Draws parts of right bar which changed since the last frame on
+        its surface: chosen hexes and controls marked as dirty. The whole
+        bar is drawn only once
+
+        Returns:
+            list(pygame.Rect): changed rectangles in right bar's space
+        '''
+
+        controls_ = self.sliders + [self.button_new_map]
+
+        if self.right_bar_surface is None:
+            self.right_bar_surface = pygame.Surface(
+                (self.window_size[0] - self.right_bar_position[0],
+                 self.window_size[1] - self.right_bar_position[1]),
+                0, self.surface)
+            self.right_bar_surface.fill((40, 40, 40))
+            self.__draw_right_bar_hexes()
+            self.__draw_right_bar_hexes_power()
+            for control in controls_:
+                control.render(self.right_bar_surface,
+                               self.right_bar_position)
+
+            return [self.right_bar_surface.get_rect()]
+
+        dirty_rects = []
+
+        if self.rendered_right_bar_hexes != self.__get_right_bar_hexes():
+            self.right_bar_surface.set_clip(self.right_bar_hexes_rect)
+            self.right_bar_surface.fill((40, 40, 40))
+            self.__draw_right_bar_hexes()
+            self.__draw_right_bar_hexes_power()
+            self.right_bar_surface.set_clip(None)
+            dirty_rects.append(self.right_bar_hexes_rect)
+
+        for control in controls_:
+            if control.is_dirty:
+                rect = self.__get_control_row_rect(control)
+                self.right_bar_surface.fill((40, 40, 40), rect)
+                control.render(self.right_bar_surface,
+                               self.right_bar_position)
+                dirty_rects.append(rect)
+
+        return dirty_rects
+
+    def __update_tiles(self, changed_indices):
+        '''
+        Patches changed hexes into cached tiles. All tiles are dropped
+        after zoom, creating a new map or when many hexes changed. While
+        zooming visible hexes are drawn directly and tiles are used again
+        from the first frame without zoom
+
+        Args:
+            changed_indices (numpy.ndarray): flat indices of changed hexes
+
+        Returns:
+            bool: True if all tiles were dropped
+        '''
+
+        tiles_key = (self.map_.side_length, self.map_.layout_version,
+                     id(self.map_.players))
+
+        is_zooming = self.map_.side_length != self.rendered_side_length
+        self.rendered_side_length = self.map_.side_length
+
+        if is_zooming:
+            self.tiles.clear()
+            self.tiles_key = None
+            return False
+
+        # Changed hexes are patched only into tiles which are cached
+        indices, boxes = self.__get_hex_boxes(changed_indices, (0, 0),
+                                              self.__get_board_rect())
+        hits = self.tiles.get_cached_tile_hits(boxes)
+
+        if self.tiles_key != tiles_key or len(hits) > \
+                MAX_DIRTY_HEXES_PART * len(
+                    self.map_.get_visible_indices(self.right_bar_rect)):
+            self.tiles.clear()
+            self.tiles_key = tiles_key
+            return True
+
+        tiles_indices = {}
+        for box, coords in hits:
+            tiles_indices.setdefault(coords, []).append(indices[box])
+
+        for coords, tile_indices in tiles_indices.items():
+            surface_rect = self.tiles.get_surface_rect(coords)
+            offset = (-surface_rect.x, -surface_rect.y)
+            self.__draw_changed_hexes(
+                self.tiles.get_cached_tile(coords),
+                self.__get_hex_rects(numpy.array(tile_indices), offset,
+                                     pygame.Rect((0, 0), surface_rect.size)),
+                offset)
+
+        return False
+
+    def __get_board_rect(self):
+        '''
+        Returns rectangle of the whole map drawn at current zoom
+
+        Returns:
+            pygame.Rect: board's rectangle in board space
+        '''
+
+        return pygame.Rect((0, 0), self.map_.get_board_size())
+
+    def __draw_tile(self, surface, rect):
+        '''
+        Draws hexes overlapping tile
+
+        Args:
+            surface (pygame.Surface): tile's surface
+
+            rect (pygame.Rect): rectangle of tile's surface in board space
+        '''
+
+        surface.fill((0, 0, 0))
+        self.__draw_hexes(
+            surface,
+            self.map_.get_hex_indices_in_rect(
+                (rect.left, rect.top, rect.right, rect.bottom), (0, 0)),
+            (-rect.x, -rect.y), self.__get_dice_number_font_size())
+
+    def __blit_tiles(self, rect):
+        '''
+        Blits tiles overlapping rectangle of the screen, missing tiles are
+        drawn
+
+        Args:
+            rect (pygame.Rect): rectangle on screen
+        '''
+
+        offset = self.map_.camera.offset
+
+        self.surface.set_clip(rect)
+        for coords in self.tiles.get_tile_coords(rect.move(
+                -offset[0], -offset[1]).clip(self.__get_board_rect())):
+            self.surface.blit(self.tiles.get_tile(coords),
+                              self.tiles.get_tile_rect(coords).move(offset),
+                              self.tiles.area)
+        self.surface.set_clip(None)
+
+    def __save_rendered_state(self):
+        '''
+        Saves copy of the state shown on screen
+        '''
+
+        self.rendered_view = self.__get_view()
+        self.rendered_owners = self.map_.owners.copy()
+        self.rendered_dice = self.map_.dice.copy()
+        self.rendered_attacking_hex_index = self.__get_attacking_hex_index()
+        self.rendered_right_bar_hexes = self.__get_right_bar_hexes()
+
+    def invalidate(self):
+        '''
+        Forgets what is shown on display, so the next frame is drawn
+        whole. It's needed when display's content is lost
+        '''
+
+        self.rendered_view = None
+
+
+    def __get_attacking_hex_index(self):
+        '''
+        Returns flat index of attacking hex or None
+        '''
+
+        if self.gameplay.attacking_hex:
+            return self.gameplay.attacking_hex.index
+
+        return None
+
+    def __get_right_bar_hexes(self):
+        '''
+        Returns everything shown in right bar above sliders
+
+        Returns:
+            tuple: colors and dice of chosen hexes and their powers
+        '''
+
+        hexes = []
+        for hex_ in (self.gameplay.attacking_hex, self.gameplay.defending_hex):
+            if hex_:
+                hexes.append((hex_.player.color, hex_.dice_number))
+            else:
+                hexes.append(None)
+
+        return (tuple(hexes), self.gameplay.attacking_hex_power,
+                self.gameplay.defending_hex_power)
+
+    def __get_control_row_rect(self, control):
+        '''
+        Returns row of right bar covered by control in right bar's space
+
+        Args:
+            control (Control): slider or button
+
+        Returns:
+            pygame.Rect: control's row
+        '''
+
+        rect = control.get_bounding_rect()
+
+        return pygame.Rect(0, rect.top - self.right_bar_position[1],
+                           self.right_bar_surface.get_width(),
+                           rect.height + 1)
+
+    def __get_changed_hex_indices(self):
+        '''
+        Returns hexes whose owner or dice number changed since the last
+        frame and hexes which stopped or started being the attacking hex
+
+        Returns:
+            numpy.ndarray: sorted flat indices of changed hexes
+        '''
+
+        if self.rendered_owners is None or \
+           self.rendered_owners.shape != self.map_.owners.shape:
+            return numpy.flatnonzero(self.map_.occupied)
+
+        changed = (self.map_.owners != self.rendered_owners) | \
+            (self.map_.dice != self.rendered_dice)
+        indices = set(numpy.flatnonzero(changed).tolist())
+
+        attacking_hex_index = self.__get_attacking_hex_index()
+        if attacking_hex_index != self.rendered_attacking_hex_index:
+            indices.update(index for index in (
+                attacking_hex_index, self.rendered_attacking_hex_index)
+                if index is not None)
+
+        return numpy.array(sorted(indices), dtype=numpy.int64)
+
+    def __get_hex_boxes(self, indices, offset, clip_rect):
+        '''
+        Returns bounding boxes of hexes, all hexes are processed at once
+
+        Args:
+            indices (numpy.ndarray): flat indices of hexes
+
+            offset (int, int): offset of hexes' geometry
+
+            clip_rect (pygame.Rect): boxes are clipped to it
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): indices of hexes whose boxes
+                aren't empty after clipping and (n, 4) array of their
+                left, top, right and bottom
+        '''
+
+        # Polygon's points are at most half_side_length_root3 and
+        # side_length away from the middle
+        half_size = numpy.array((self.map_.half_side_length_root3,
+                                 self.map_.side_length))
+        middles = self.map_.get_hex_middles(indices, offset)
+
+        boxes = numpy.hstack((
+            numpy.maximum(middles - half_size - 1, clip_rect.topleft),
+            numpy.minimum(middles + half_size + 1, clip_rect.bottomright)))
+        is_empty = (boxes[:, :2] >= boxes[:, 2:]).any(axis=1)
+
+        return indices[~is_empty], boxes[~is_empty]
+
+    def __get_hex_rects(self, indices, offset, clip_rect):
+        '''
+        Returns bounding rectangles of hexes
+
+        Args:
+            indices (numpy.ndarray): flat indices of hexes
+
+            offset (int, int): offset of hexes' geometry
+
+            clip_rect (pygame.Rect): rectangles are clipped to it
+
+        Returns:
+            list((int, pygame.Rect)): index and rectangle of every hex
+                whose rectangle isn't empty after clipping
+        '''
+
+        if not len(indices):
+            return []
+
+        indices, boxes = self.__get_hex_boxes(indices, offset, clip_rect)
+
+        return [(index, pygame.Rect(left, top, right - left, bottom - top))
+                for index, (left, top, right, bottom) in zip(
+                    indices.tolist(), boxes.tolist())]
+
+    def __draw_changed_hexes(self, surface, hex_rects, offset):
+        '''
+        Every changed hex's rectangle is cleared and drawn again with its
+        neighbours, which are the only hexes overlapping it
+
+        Args:
+            surface (pygame.Surface): surface to draw on
+
+            hex_rects (list((int, pygame.Rect))): changed hexes and their
+                rectangles on surface, see __get_hex_rects
+
+            offset (int, int): offset of hexes' geometry on surface
+
+        Returns:
+            list(pygame.Rect): changed rectangles
+        '''
+
+        if not hex_rects:
+            return []
+
+        font_size = self.__get_dice_number_font_size()
+
+        dirty_rects = []
+        for index, rect in hex_rects:
+            neighbours = self.map_.neighbours[index]
+            hexes_to_draw = numpy.sort(numpy.append(
+                neighbours[neighbours >= 0], index))
+            hexes_to_draw = hexes_to_draw[
+                self.map_.occupied.ravel()[hexes_to_draw]]
+
+            surface.set_clip(rect)
+            surface.fill((0, 0, 0))
+            self.__draw_hexes(surface, hexes_to_draw, offset, font_size)
+            surface.set_clip(None)
+
+            dirty_rects.append(rect)
+
+        return dirty_rects
+
+    def __copy_changed_hexes_from_tiles(self, hex_rects):
+        '''
+        Copies already patched hexes from tiles to screen
+
+        Args:
+            hex_rects (list((int, pygame.Rect))): changed hexes and their
+                rectangles on screen, see __get_hex_rects
+
+        Returns:
+            list(pygame.Rect): changed rectangles
+        '''
+
+        dirty_rects = []
+        for index, rect in hex_rects:
+            self.__blit_tiles(rect)
+            dirty_rects.append(rect)
+
+        return dirty_rects
+
+    def __get_dice_number_font_size(self):
+        '''
+        Returns size of dice number text, it depends on hex's side length
+
+        Returns:
+            int: font's size
+        '''
+
+        return int(self.map_.side_length)
 
     def __draw_visible_hexes(self):
         '''
         Draws all hexes in rendering range
         '''
 
-        # The number of dice on a hex text change dependently on hex's side length
-        font_dice_number_text_size = int(self.map_.side_length)
-        font_dice_number_text = pygame.font.SysFont(
-            'timesnewroman', font_dice_number_text_size, 1)
+        self.__draw_hexes(self.surface,
+                          self.map_.get_visible_indices(self.right_bar_rect),
+                          self.map_.camera.offset,
+                          self.__get_dice_number_font_size())
+
+    def __draw_hexes(self, surface, indices, offset, font_size):
+        '''
+        Draws hexes with given flat indices with their dice numbers
+
+        Args:
+            surface (pygame.Surface): surface to draw on
+
+            indices (numpy.ndarray): hexes' indices in flat 2d array
+                representation of map
+
+            offset (int, int): offset of hexes' geometry on surface
+
+            font_size (int): size of dice number text
+        '''
+
+        side_length = self.map_.side_length
+
+        if side_length <= self.hex_sprites_max_side_length:
+            self.__blit_hex_sprites(surface, indices, offset)
+        else:
+            self.__draw_hex_polygons(surface, indices, offset)
+
+        if side_length < self.dice_number_min_side_length:
+            return
+
+        middles = self.map_.get_hex_middles(indices, offset).tolist()
+        dice = self.map_.dice.ravel()[indices].tolist()
+
+        surface.blits([(
+            self.dice_number_glyphs.render(
+                font_size, str(dice_number), (255, 255, 255)),
+            (middle[0] - font_size / 4, middle[1] - font_size / 2))
+            for middle, dice_number in zip(middles, dice)], False)
+
+    def __draw_hex_polygons(self, surface, indices, offset):
+        '''
+        Draws polygons of hexes, attacking hex is drawn outlined
+
+        Args:
+            surface (pygame.Surface): surface to draw on
+
+            indices (numpy.ndarray): hexes' indices in flat 2d array
+                representation of map
+
+            offset (int, int): offset of hexes' geometry on surface
+        '''
+
+        # Geometry of all hexes is transformed by camera at once
+        polygons = self.map_.get_hex_polygons(indices, offset).tolist()
+        owners = self.map_.owners.ravel()[indices].tolist()
+        colors = [player.color for player in self.map_.players]
 
-        # If hex is attacking hex draw it outlined
-        for hex_ in self.map_.get_visibile_hex_list(self.right_bar_rect):
-            if hex_ == self.gameplay.attacking_hex:
-                pygame.draw.lines(self.surface, hex_.player.color, True, 
-                                  hex_.polygon, 1)
+        attacking_hex_index = self.__get_attacking_hex_index()
+
+        for index, polygon, owner in zip(indices.tolist(), polygons, owners):
+            if index == attacking_hex_index:
+                pygame.draw.lines(surface, colors[owner], True,
+                                  polygon, 1)
             else:
-                pygame.draw.polygon(self.surface, hex_.player.color, 
-                                    hex_.polygon)
+                pygame.draw.polygon(surface, colors[owner], polygon)
+
+    def __blit_hex_sprites(self, surface, indices, offset):
+        '''
+        Blits pre-rendered sprites of hexes in one call, attacking hex is
+        drawn outlined afterwards
 
-            dice_number_text = font_dice_number_text.render(
-                str(hex_.dice_number), True, (255, 255, 255))
+        Args:
+            surface (pygame.Surface): surface to draw on
+
+            indices (numpy.ndarray): hexes' indices in flat 2d array
+                representation of map
+
+            offset (int, int): offset of hexes' geometry on surface
+        '''
 
-            self.surface.blit(dice_number_text, (
-                hex_.middle[0] - font_dice_number_text_size / 4,
-                hex_.middle[1] - font_dice_number_text_size / 2))
+        sprites = self.__get_hex_sprites()
+        colors = [player.color for player in self.map_.players]
 
-        pygame.draw.rect(self.surface, (40, 40, 40), self.right_bar_rect)
+        # Sprite's top left corner is hex's middle moved by its half size
+        corners = (self.map_.get_hex_middles(indices, offset) -
+                   (self.map_.half_side_length_root3,
+                    self.map_.side_length)).tolist()
+        owners = self.map_.owners.ravel()[indices].tolist()
+
+        attacking_hex_index = self.__get_attacking_hex_index()
+        is_attacking = indices == attacking_hex_index
+
+        surface.blits([(sprites[colors[owner]], corner)
+                       for corner, owner, attacking in zip(
+                           corners, owners, is_attacking.tolist())
+                       if not attacking], False)
+
+        if is_attacking.any():
+            self.__draw_hex_polygons(surface, indices[is_attacking], offset)
+
+    def __get_hex_sprites(self):
+        '''
+        Returns sprite of hex for every player's color at current side
+        length, they are drawn again only after zoom
+
+        Returns:
+            dict: color to pygame.Surface
+        '''
+
+        if self.hex_sprites_side_length != self.map_.side_length:
+            self.hex_sprites = {}
+            self.hex_sprites_side_length = self.map_.side_length
+
+        polygon_offsets = self.map_.camera.polygon_offsets + \
+            (self.map_.half_side_length_root3, self.map_.side_length)
+
+        for player in self.map_.players:
+            if player.color not in self.hex_sprites:
+                sprite = pygame.Surface(
+                    (2 * self.map_.half_side_length_root3 + 1,
+                     2 * self.map_.side_length + 1), 0, self.surface)
+                sprite.fill(HEX_SPRITE_COLORKEY)
+                pygame.draw.polygon(sprite, player.color,
+                                    polygon_offsets.tolist())
+                sprite.set_colorkey(HEX_SPRITE_COLORKEY, pygame.RLEACCEL)
+                self.hex_sprites[player.color] = sprite
+
+        return self.hex_sprites
 
 
     def __draw_right_bar_hexes(self):
         '''
-        Draws choosen hexes representation on right bar
+        Draws choosen hexes representation on right bar's surface
         '''
 
         if self.gameplay.attacking_hex:
             pygame.draw.polygon(
-                self.surface, 
+                self.right_bar_surface, 
                 self.gameplay.attacking_hex.player.color,
                 self.attacking_hex_representation_polygon)
 
@@ -368,7 +1061,7 @@ class Graphics:
                 str(self.gameplay.attacking_hex.dice_number),
                 True, (255, 255, 255))
 
-            self.surface.blit(attacking_hex_text, (
+            self.right_bar_surface.blit(attacking_hex_text, (
                 self.attacking_hex_representation_middle[0] -
                 self.font_bar_size / 4,
                 self.attacking_hex_representation_middle[1] -
@@ -376,14 +1069,14 @@ class Graphics:
 
         if self.gameplay.defending_hex:
             pygame.draw.polygon(
-                self.surface,
+                self.right_bar_surface,
                 self.gameplay.defending_hex.player.color,
                 self.defending_hex_representation_polygon)
 
             defending_hex_text = self.font_bar.render(
                 str(self.gameplay.defending_hex.dice_number),
                 True, (255, 255, 255))
-            self.surface.blit(defending_hex_text, (
+            self.right_bar_surface.blit(defending_hex_text, (
                 self.defending_hex_representation_middle[0] -
                 self.font_bar_size / 4,
                 self.defending_hex_representation_middle[1] -
@@ -392,7 +1085,7 @@ class Graphics:
 
     def __draw_right_bar_hexes_power(self):
         '''
-        Draws choosen hexes power representation on right bar
+        Draws choosen hexes power representation on right bar's surface
         '''
 
         if self.gameplay.attacking_hex_power:
@@ -400,7 +1093,7 @@ class Graphics:
                 str(self.gameplay.attacking_hex_power), True,
                 self.gameplay.attacking_hex.player.color)
 
-            self.surface.blit(attacking_hex_power_text, (
+            self.right_bar_surface.blit(attacking_hex_power_text, (
                 self.attacking_hex_power_representation_middle[0] -
                 self.font_bar_size / 4,
                 self.attacking_hex_power_representation_middle[1] -
@@ -411,19 +1104,8 @@ class Graphics:
                 str(self.gameplay.defending_hex_power), True,
                 self.gameplay.defending_hex.player.color)
 
-            self.surface.blit(defending_hex_power_text, (
+            self.right_bar_surface.blit(defending_hex_power_text, (
                 self.defending_hex_power_representation_middle[0] -
                 self.font_bar_size / 4,
                 self.defending_hex_power_representation_middle[1] -
                 self.font_bar_size / 2))
-
-
-    def __draw_controls(self):
-        '''
-        Draws controls
-        '''
-        
-        for slider in self.sliders:
-            slider.render(self.surface)
-
-        self.button_new_map.render(self.surface)
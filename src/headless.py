@@ -0,0 +1,276 @@
+'''
+Headless game engine. Plays complete games with Map and Gameplay
+objects only, without display, pygame or fight delays
+'''
+
+import numpy
+
+import game
+import map
+import odds
+
+
+# Geometry isn't used without display, but map needs it
+DEFAULT_SIDE_LENGTH = 32
+WINDOW_SIZE = (1920, 1080)
+
+
+class GameResult:
+    def __init__(self, winner, rounds, fights, hex_numbers):
+        '''
+        Initializes GameResult object
+
+        Args:
+            winner (int or None): index of player who conquered all hexes,
+                None if the game was stopped after max rounds
+
+            rounds (int): ammount of played rounds
+
+            fights (int): ammount of fights
+
+            hex_numbers (list(int)): ammount of hexes of every player at
+                the end of the game
+        '''
+
+        self.winner = winner
+        self.rounds = rounds
+        self.fights = fights
+        self.hex_numbers = hex_numbers
+
+
+class OddsStrategy:
+    '''
+    Scripted player. Attacks the target with the highest probability of
+    winning as long as it's at least min_win_probability
+    '''
+
+    def __init__(self, min_win_probability=0.5):
+        '''
+        Initializes OddsStrategy object
+
+        Args:
+            min_win_probability (float): the lowest probability of winning
+                player accepts
+        '''
+
+        self.min_win_probability = min_win_probability
+
+    def choose_attack(self, gameplay, player_index):
+        '''
+        Returns next attack or None to finish the turn
+
+        Args:
+            gameplay (Gameplay): gameplay object
+
+            player_index (int): index of playing player
+
+        Returns:
+            (Hex, Hex) or None: attacking and defending hex
+        '''
+
+        map_ = gameplay.map_
+        owners = map_.owners.ravel()
+        dice_on_hexes = map_.dice.ravel()
+
+        attacking_indices = numpy.flatnonzero(
+            (owners == player_index) & (dice_on_hexes > 1))
+        if not len(attacking_indices):
+            return None
+
+        neighbours = map_.neighbours[attacking_indices]
+        is_target = neighbours >= 0
+        neighbours = numpy.where(is_target, neighbours, 0)
+        is_target &= map_.occupied.ravel()[neighbours] & \
+            (owners[neighbours] != player_index)
+
+        table = odds.get_win_probability_table(
+            gameplay.die_sides_number,
+            max(gameplay.max_dice_on_single_hex, int(dice_on_hexes.max())))
+        win_probabilities = numpy.where(
+            is_target, table[dice_on_hexes[attacking_indices, numpy.newaxis],
+                             dice_on_hexes[neighbours]], -1.0)
+
+        attacker, target = numpy.unravel_index(
+            numpy.argmax(win_probabilities), win_probabilities.shape)
+        if win_probabilities[attacker, target] < self.min_win_probability:
+            return None
+
+        return (map_.get_hex_by_index(attacking_indices[attacker]),
+                map_.get_hex_by_index(neighbours[attacker, target]))
+
+
+class HeadlessGame:
+    '''
+    Plays a complete game at full speed. Every player is played either by
+    gameplay's AI or by a scripted strategy
+    '''
+
+    def __init__(self, map_size, hex_number, players_number,
+                 die_sides_number=6, max_dice_on_single_hex=8,
+                 dice_per_hex=4, strategies=None, seed=None,
+                 max_rounds=1000, regions_engine='index'):
+        '''
+        Initializes HeadlessGame object and creates a map
+
+        Args:
+            map_size (int, int): map's size in hexes
+
+            hex_number (int): ammount of hexes on the map
+
+            players_number (int): ammount of players
+
+            die_sides_number (int): how many sides single die has
+
+            max_dice_on_single_hex (int): maximum ammount of dice
+                on a single hex
+
+            dice_per_hex (int): average count of dice per hex
+
+            strategies (list): strategy of every player, None means
+                gameplay's AI. Strategy has choose_attack(gameplay,
+                player_index) method returning (Hex, Hex) or None
+
+            seed (int): seed of the game, random if None
+
+            max_rounds (int): game is stopped without winner after
+                this ammount of rounds
+
+            regions_engine (string): see Gameplay
+        '''
+
+        map_seed, gameplay_seed = numpy.random.SeedSequence(
+            seed).generate_state(2).tolist()
+
+        players = [game.Player((player, player, player))
+                   for player in range(players_number)]
+
+        self.map_ = map.Map(map_size, hex_number, players, dice_per_hex,
+                            DEFAULT_SIDE_LENGTH, WINDOW_SIZE, seed=map_seed)
+        self.map_.create_map()
+
+        self.gameplay = game.Gameplay(
+            self.map_, die_sides_number, 0, max_dice_on_single_hex,
+            regions_engine=regions_engine, seed=gameplay_seed)
+
+        self.strategies = strategies or [None] * players_number
+        self.max_rounds = max_rounds
+
+        self.rounds = 0
+        self.fights = 0
+
+    def play(self):
+        '''
+        Plays rounds until one player conquers all hexes or until
+        max rounds
+
+        Returns:
+            GameResult: result of the game
+        '''
+
+        winner = self.gameplay.get_winner()
+        while winner is None and self.rounds < self.max_rounds:
+            winner = self.play_round()
+
+        return GameResult(winner, self.rounds, self.fights,
+                          self.gameplay.get_hex_numbers().tolist())
+
+    def play_round(self):
+        '''
+        Every player which still has hexes makes a turn
+
+        Returns:
+            int or None: winner's index if the game is over
+        '''
+
+        self.rounds += 1
+
+        for player_index in range(len(self.map_.players)):
+            if not self.gameplay.get_hex_numbers()[player_index]:
+                continue
+
+            self.play_turn(player_index)
+
+            winner = self.gameplay.get_winner()
+            if winner is not None:
+                return winner
+
+        return None
+
+    def play_turn(self, player_index):
+        '''
+        Plays all attacks of a single player and adds dice to his hexes
+
+        Args:
+            player_index (int): index of playing player
+        '''
+
+        self.gameplay.current_player_index = player_index
+        strategy = self.strategies[player_index]
+
+        if strategy is None:
+            self.gameplay.prepare_enemy_ai()
+            while self.gameplay.ai_coords_and_hexes_list:
+                self.gameplay.enemy_ai(
+                    self.gameplay.ai_coords_and_hexes_list.pop(0))
+                self.__finish_fight()
+        else:
+            while True:
+                attack = strategy.choose_attack(self.gameplay, player_index)
+                if attack is None:
+                    break
+
+                self.__check_attack(player_index, *attack)
+                self.gameplay.attacking_hex, self.gameplay.defending_hex = \
+                    attack
+                self.gameplay.fight()
+                self.__finish_fight()
+
+        self.gameplay.attacking_hex = None
+        self.gameplay.defending_hex = None
+        self.gameplay.add_dice(self.map_.players[player_index])
+
+    def __check_attack(self, player_index, attacking_hex, defending_hex):
+        '''
+        Raises exception if scripted player's attack breaks game's rules
+
+        Args:
+            player_index (int): index of playing player
+
+            attacking_hex (Hex): attacking hex
+
+            defending_hex (Hex): defending hex
+        '''
+
+        if self.map_.owners[attacking_hex.coords] != player_index or \
+           attacking_hex.dice_number < 2 or \
+           self.map_.owners[defending_hex.coords] == player_index or \
+           not self.map_.are_neighbours(attacking_hex.index,
+                                        defending_hex.index):
+            raise Exception('attack isn\'t possible')
+
+    def __finish_fight(self):
+        '''
+        Finishes rolled fight without waiting
+        '''
+
+        if self.gameplay.fight_finished:
+            self.fights += 1
+            self.gameplay.fight_finish()
+
+
+def play_game(*args, **kwargs):
+    '''
+    Creates headless game with given arguments (see HeadlessGame) and
+    plays it
+
+    Returns:
+        GameResult: result of the game
+    '''
+
+    return HeadlessGame(*args, **kwargs).play()
+
+
+if __name__ == '__main__':
+    result = play_game((20, 20), 200, 4, seed=0)
+    print('winner: {}, rounds: {}, fights: {}'.format(
+        result.winner, result.rounds, result.fights))
@@ -7,10 +7,20 @@ import graphics
 import events
 
 
+# Without chosen render scale displays wider than this are drawn at this
+# width and scaled up
+MAX_RENDER_WIDTH = 1920
+
+
 class Main:
-    def __init__(self):
+    def __init__(self, render_scale=None):
         '''
         Initializes main game objects
+
+        Args:
+            render_scale (float): everything is drawn at this fraction of
+                display's resolution and scaled to the display, chosen so
+                drawn width is at most MAX_RENDER_WIDTH if None
         '''
 
         pygame.init()
@@ -18,14 +28,22 @@ class Main:
 
         resolution = pygame.display.Info()
 
-        self.window_size = (resolution.current_w, resolution.current_h)
+        self.display_size = (resolution.current_w, resolution.current_h)
+        if render_scale is None:
+            render_scale = min(1.0, MAX_RENDER_WIDTH / self.display_size[0])
+        if not (0.0 < render_scale <= 1.0):
+            raise Exception('render_scale isn\'t in possible range')
+
+        self.window_size = (round(self.display_size[0] * render_scale),
+                            round(self.display_size[1] * render_scale))
 
         self.map_ = map.Map((5, 5), 10, players, 4, 32, self.window_size)
         self.map_.create_map()
 
         self.gameplay = game.Gameplay(self.map_, 6, 2000, 8)
-        self.graphics = graphics.Graphics(self.map_, self.gameplay,
-                                          self.window_size)
+        self.graphics = graphics.Graphics(
+            self.map_, self.gameplay, self.window_size,
+            display_size=self.display_size)
         self.event_handler = events.EventHandler(self.map_, self.graphics,
                                                  self.gameplay)
 
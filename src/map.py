@@ -1,25 +1,85 @@
-import numpy
 import math
-import random
+import numpy
+
+import camera
+import distribution
+import regions
+
+
+# Index shifts to neighbours in 2d array representation of map.
+# Direction 0 means top left side and it goes clockwise
+HEX_DIRECTIONS = ((-1, 0), (-1, 1), (1, 0), (1, -1), (0, -1), (0, 1))
+# Limits of hex's side length when zooming
+MIN_SIDE_LENGTH = 6
+MAX_SIDE_LENGTH = 60
 
 
 class Hex:
-    def __init__(self, middle, polygon, player):
+    '''
+    Thin view of a single hex. Hex's state lives in map's arrays, this
+    object only knows where to find it
+    '''
+
+    def __init__(self, map_, coords):
         '''
         Initializes hex object
 
         Args:
-            middle (int, int): hex's middle point
+            map_ (Map): map object which stores hex's state
+
+            coords (int, int): hex's index in 2d array representation of map
+        '''
+
+        self.map_ = map_
+        self.coords = (int(coords[0]), int(coords[1]))
+        self.index = self.coords[0] * map_.shape[1] + self.coords[1]
+
+    def __eq__(self, other):
+        return type(other) == Hex and self.map_ is other.map_ and \
+            self.index == other.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    @property
+    def player(self):
+        '''
+        Player object owning the hex
+        '''
+
+        return self.map_.players[self.map_.owners[self.coords]]
+
+    @player.setter
+    def player(self, player):
+        self.map_.set_owner(self.index, self.map_.get_player_index(player))
+
+    @property
+    def dice_number(self):
+        '''
+        Number of dice on the hex
+        '''
+
+        return int(self.map_.dice[self.coords])
+
+    @dice_number.setter
+    def dice_number(self, dice_number):
+        self.map_.dice[self.coords] = dice_number
+
+    @property
+    def middle(self):
+        '''
+        Hex's middle point shifted by map's pos_shift
+        '''
 
-            polygon (list(int, int)): list of points forming hex's polygon
+        return self.map_.get_hex_middle(self.coords)
 
-            player: player object
+    @property
+    def polygon(self):
+        '''
+        List of points forming hex's polygon
         '''
 
-        self.middle = middle
-        self.polygon = polygon
-        self.player = player
-        self.dice_number = 0
+        return self.map_.calculate_hex_polygon(self.middle)
 
     def is_point_inside_polygon(self, point):
         '''
@@ -32,20 +92,21 @@ class Hex:
             True if point is inside polygon
         '''
 
+        polygon = self.polygon
         is_inside = False
 
         i = 0
-        j = len(self.polygon) - 1
+        j = len(polygon) - 1
 
         # Algorithm calculates if point is inside of the polygon
-        while i < len(self.polygon):
+        while i < len(polygon):
             if ((
-                self.polygon[i][1] > point[1]) !=
-                (self.polygon[j][1] > point[1])) and \
-                    (point[0] < (self.polygon[j][0]-self.polygon[i][0]) *
-                        (point[1]-self.polygon[i][1]) /
-                        (self.polygon[j][1]-self.polygon[i][1]) +
-                        self.polygon[i][0]):
+                polygon[i][1] > point[1]) !=
+                (polygon[j][1] > point[1])) and \
+                    (point[0] < (polygon[j][0]-polygon[i][0]) *
+                        (point[1]-polygon[i][1]) /
+                        (polygon[j][1]-polygon[i][1]) +
+                        polygon[i][0]):
                 is_inside = not is_inside
 
             j = i
@@ -56,7 +117,7 @@ class Hex:
 
 class Map:
     def __init__(self, size, hex_number, players, dice_per_hex,
-                 default_side_length, window_size):
+                 default_side_length, window_size, seed=None):
         '''
         Initializes map object
 
@@ -72,349 +133,536 @@ class Map:
             default_side_length (int): hex's side length in pixels
 
             window_size (int, int): window size 
+
+            seed (int): seed of map's random numbers generator, random
+                if None
         '''
 
         self.size = size
 
         self.hex_number = hex_number
 
-        self.hex_map = numpy.zeros([self.size[0], self.size[1]], dtype=Hex)
-
         self.players = players
 
+        self.layout_version = 0
+        self.owners_version = 0
+        self.__init_board()
+
         self.dice_per_hex = dice_per_hex
         self.dice_number = self.hex_number * self.dice_per_hex
 
         self.window_size = window_size
 
-        # Position shift needed for moving around the map
-        self.pos_shift = [0, 0]
+        self.rng = numpy.random.default_rng(seed)
 
         self.default_side_length = default_side_length
-        self.__init_side_lengths(default_side_length)
+        self.camera = camera.Camera(default_side_length)
+
+    def __init_board(self):
+        '''
+        Initializes empty board arrays. Owner is an index in players list,
+        -1 means there is no hex on the field
+        '''
+
+        # size may be changed by new game options before map is created,
+        # so board arrays keep their own shape
+        self.shape = (self.size[0], self.size[1])
 
+        self.owners = numpy.full(self.shape, -1, dtype=numpy.int16)
+        self.dice = numpy.zeros(self.shape, dtype=numpy.uint8)
+        self.occupied = numpy.zeros(self.shape, dtype=bool)
 
-    def __init_side_lengths(self, side_length):
+        # Incremented whenever fields occupied by hexes change, so cached
+        # results depending on map's layout can be invalidated
+        self.layout_version += 1
+        self.visible_indices_cache = (None, None)
+
+        self.__init_neighbours()
+        self.__init_lattice_points()
+        self.__init_regions()
+
+    def __init_regions(self):
+        '''
+        Initializes index of connected regions of every player's hexes
         '''
-        Initializes attributes related to hex's side length
 
-        Args:
-            side_length (int): hex's side length in pixels
+        # Incremented whenever owners change, so results depending on
+        # players' regions can be cached
+        self.owners_version += 1
+        self.regions = regions.RegionIndex(self.owners, self.neighbours,
+                                           len(self.players))
+
+    def __init_lattice_points(self):
+        '''
+        Initializes hex's middle points in board space. Row n holds
+        lattice point of field with flat index n, see Camera
         '''
 
-        self.side_length = side_length
-        self.half_side_length = int(self.side_length / 2)
-        self.half_side_length_root3 = int(self.half_side_length * math.sqrt(3))
+        rows, columns = numpy.indices(self.shape)
+        self.lattice_points = numpy.stack(
+            (2 * rows + columns + 1, columns), axis=-1).reshape(-1, 2)
+        self.max_lattice_point = (2 * self.shape[0] + self.shape[1] - 2,
+                                  self.shape[1] - 1)
 
-    def __recalculate_hex_polygons(self):
+    def __init_neighbours(self):
         '''
-        Recalculates all hex's middle points and polygons.
-        Middle is shifted by pos_shift
+        Initializes neighbours table. Row n holds flat indices of
+        neighbours of field with flat index n in HEX_DIRECTIONS order,
+        -1 means that neighbour would be outside of the map
         '''
 
-        for i in range(self.hex_map.shape[0]):
-            for j in range(self.hex_map.shape[1]):
-                if type(self.hex_map[i, j]) == Hex:
-                    hex_middle = self.__calculate_hex_middle((i, j))
-                    hex_middle_shifted = [item1 + item2 for item1, item2 in
-                                          zip(hex_middle, self.pos_shift)]
-                    self.hex_map[i, j].middle = hex_middle_shifted
-                    self.hex_map[i, j].polygon = \
-                        self.calculate_hex_polygon(hex_middle_shifted)
+        rows, columns = numpy.indices(self.shape)
+        self.neighbours = numpy.full(
+            (self.shape[0] * self.shape[1], len(HEX_DIRECTIONS)), -1,
+            dtype=numpy.int32)
 
-    def __calculate_hex_middle(self, point):
+        for direction, (row_shift, column_shift) in enumerate(HEX_DIRECTIONS):
+            neighbour_rows = rows + row_shift
+            neighbour_columns = columns + column_shift
+            is_on_map = \
+                (neighbour_rows >= 0) & (neighbour_rows < self.shape[0]) & \
+                (neighbour_columns >= 0) & \
+                (neighbour_columns < self.shape[1])
+
+            self.neighbours[:, direction] = numpy.where(
+                is_on_map, neighbour_rows * self.shape[1] + neighbour_columns,
+                -1).ravel()
+
+    @property
+    def hex_map(self):
+        '''
+        2d array of Hex views, 0 where there is no hex. Kept for legacy
+        callers, hot paths should use owners, dice and occupied arrays
         '''
-        Calculates and returns hex's middle point coords
 
-        Arguments:
-            point (int, int): hex's index in 2d array representation
-                of map
+        hex_map = numpy.zeros(self.shape, dtype=object)
+        for coords in zip(*numpy.nonzero(self.occupied)):
+            hex_map[coords] = Hex(self, coords)
+
+        return hex_map
+
+    def get_hex(self, coords):
+        '''
+        Returns hex with given coords or None if there is no hex
+
+        Args:
+            coords (int, int): hex's index in 2d array representation of map
 
         Returns:
-            (int, int): hex's middle point coords
+            Hex or None: hex view
         '''
 
-        hex_middle = [0, 0]
+        if not self.__is_point_on_map(coords) or \
+           not self.occupied[coords[0], coords[1]]:
+            return None
 
-        hex_middle[0] += self.half_side_length_root3
-        hex_middle[1] += self.side_length
+        return Hex(self, coords)
 
-        hex_middle[0] += (point[0] * 2*self.half_side_length_root3)
-        hex_middle[0] += (point[1] * self.half_side_length_root3)
-        hex_middle[1] += (point[1] *
-                          (self.half_side_length + self.side_length))
+    def get_hex_by_index(self, index):
+        '''
+        Returns hex with given flat index or None if there is no hex
 
-        return hex_middle
+        Args:
+            index (int): hex's index in flat 2d array representation of map
 
-    def calculate_hex_polygon(self, hex_middle):
+        Returns:
+            Hex or None: hex view
         '''
-        Calculates and returns hex's polygon
+
+        return self.get_hex(divmod(int(index), self.shape[1]))
+
+    def get_neighbour_indices(self, index):
+        '''
+        Returns flat indices of occupied neighbours of given field
 
         Args:
-            hex_middle (int, int): hex's middle point coords
+            index (int): field's index in flat 2d array representation of map
 
         Returns:
-            list(int, int): list of points forming hex's polygon
+            numpy.ndarray: flat indices of neighbour hexes
         '''
 
-        polygon = (
-            (hex_middle[0], hex_middle[1] + self.side_length),
-            (hex_middle[0] + self.half_side_length_root3,
-             hex_middle[1] + self.half_side_length),
-            (hex_middle[0] + self.half_side_length_root3,
-             hex_middle[1] - self.half_side_length),
-            (hex_middle[0], hex_middle[1] - self.side_length),
-            (hex_middle[0] - self.half_side_length_root3,
-             hex_middle[1] - self.half_side_length),
-            (hex_middle[0] - self.half_side_length_root3,
-             hex_middle[1] + self.half_side_length))
+        neighbours = self.neighbours[index]
+        neighbours = neighbours[neighbours >= 0]
 
-        return polygon
+        return neighbours[self.occupied.ravel()[neighbours]]
 
-    def resize_polygons(self, side_length):
+    def are_neighbours(self, index, other_index):
         '''
-        Changes hex's side length, then resizes hex's polygon.
-        Side length >= 6 and <= 60
+        Returns True if fields with given flat indices are adjacent
 
         Args:
-            side_length (int) -- hex's side length
+            index (int): field's index in flat 2d array representation of map
+
+            other_index (int): other field's index
+
+        Returns:
+            True if fields are adjacent
         '''
 
-        if side_length >= 6 and side_length <= 60:
-            self.__init_side_lengths(side_length)
-            self.__recalculate_hex_polygons()
+        return other_index in self.neighbours[index]
 
-    def move_polygons(self, pos_shift):
+    def get_hex_list(self, mask=None):
         '''
-        Moves hex's polygon by given shift
+        Returns list of hexes in flat 2d array order
 
         Args:
-            pos_shift (int, int): position shift
+            mask (numpy.ndarray): optional boolean mask, by default all
+                occupied fields are used
+
+        Returns:
+            list(Hex): list of hex views
+        '''
+
+        if mask is None:
+            mask = self.occupied
+
+        return [Hex(self, coords) for coords in zip(*numpy.nonzero(mask))]
+
+    def set_owner(self, index, owner):
         '''
+        Changes hex's owner and updates connected regions
 
-        self.pos_shift = [item1 + item2 for item1, item2 in
-                          zip(self.pos_shift, pos_shift)]
+        Args:
+            index (int): hex's index in flat 2d array representation of map
+
+            owner (int): new owner's index in players list
+        '''
 
-        self.__recalculate_hex_polygons()
+        self.owners.flat[index] = owner
+        self.owners_version += 1
+        self.regions.set_owner(index, owner)
 
-    def __side_to_point_diff(self, side, point):
+    def get_player_index(self, player):
         '''
-        Map is generated through adding new hexes to already existing 
-        hexes sides. Moves 2darray indexes according to chosen site
+        Returns player's id used in owners array
 
         Args:
-            side (int): where to move (0 .. 5)
-            point (int, int): index on hex's 2darray map to move
+            player (Player): player object
 
         Returns:
-            (int, int): moved point if it's in map boundaries else old point
+            int: index of player in players list
         '''
 
-        point_ = point[:]
+        return self.players.index(player)
 
-        if side == 0:
-            point_[1] += 1
-        elif side == 1:
-            point_[0] += 1
-        elif side == 2:
-            point_[0] += 1
-            point_[1] -= 1
-        elif side == 3:
-            point_[1] -= 1
-        elif side == 4:
-            point_[0] -= 1
-        elif side == 5:
-            point_[0] -= 1
-            point_[1] += 1
+    @property
+    def pos_shift(self):
+        '''
+        Position shift needed for moving around the map
+        '''
 
-        if self.__is_point_on_map(point_):
-            return point_
+        return self.camera.offset
 
-        return point
+    @property
+    def side_length(self):
+        return self.camera.side_length
 
-    def __is_point_on_map(self, point):
+    @property
+    def half_side_length(self):
+        return self.camera.half_side_length
+
+    @property
+    def half_side_length_root3(self):
+        return self.camera.half_side_length_root3
+
+    def get_hex_middle(self, coords):
         '''
-        Returns True if point is in map's boundaries else False
+        Returns hex's middle point shifted by pos_shift
 
         Args:
-            point (int, int): (index on hex's 2d array map)
+            coords (int, int): hex's index in 2d array representation of map
 
         Returns:
-            True if it's inside map's boundaries
+            (int, int): hex's middle point coords
         '''
 
-        if (point[0] < 0 or point[0] >= self.size[0]) or (point[1] < 0 or
-           point[1] >= self.size[1]):
-            return False
+        return [(2 * coords[0] + coords[1] + 1) *
+                self.camera.half_side_length_root3 + self.camera.offset[0],
+                coords[1] * self.camera.row_height + self.camera.side_length +
+                self.camera.offset[1]]
 
-        return True
+    def get_hex_middles(self, indices, offset=None):
+        '''
+        Returns middle points of hexes with given flat indices
+
+        Args:
+            indices (numpy.ndarray): hex's indices in flat 2d array
+                representation of map
 
-    def __create_hex_distribution_list(self):
+            offset (int, int): offset used instead of camera's one
+
+        Returns:
+            numpy.ndarray: (n, 2) array of middle points on screen
         '''
-        Returns list with number of hexes per player. Each element
-               corresponds to player in players list
+
+        return self.camera.to_screen(self.lattice_points[indices], offset)
+
+    def get_board_size(self):
+        '''
+        Returns size in pixels of the whole map drawn at current zoom
 
         Returns:
-            list(int): list with number of hexes per player
+            (int, int): width and height
         '''
 
-        hex_per_player = self.hex_number // len(self.players)
-        hex_distribution_list = [hex_per_player] * len(self.players)
+        return self.camera.get_board_size(self.max_lattice_point)
+
+    def get_hex_polygons(self, indices, offset=None):
+        '''
+        Returns polygons of hexes with given flat indices
 
-        # All players have the same ammount of hexes,
-        # then leftovers are distributed randomly
-        # with maximum of one additional hex per player
-        for hex_left in range(self.hex_number % len(self.players), 0, -1):
-            while True:
-                hex_choosen = random.randrange(len(hex_distribution_list))
-                if hex_distribution_list[hex_choosen] == hex_per_player:
-                    hex_distribution_list[hex_choosen] += 1
-                    break
+        Args:
+            indices (numpy.ndarray): hex's indices in flat 2d array
+                representation of map
 
-        return hex_distribution_list
+            offset (int, int): offset used instead of camera's one
 
-    def __choose_player(self, hex_distribution_list):
+        Returns:
+            numpy.ndarray: (n, 6, 2) array of polygon points on screen
         '''
-        Chooses player from list and removes one hex distributed to him
+
+        return self.camera.to_screen_polygons(self.lattice_points[indices],
+                                              offset)
+
+    def pick_hex(self, point):
+        '''
+        Returns hex containing given point or None. Point is converted to
+        grid coords with inverted layout math, so the result is refined
+        with at most four polygon tests
 
         Args:
-            hex_distribution_list list(int): list with number of hexes per
-                player
+            point (int, int): point on screen, mostly mouse position
 
         Returns:
-            int: player index
+            Hex or None: hex under the point
         '''
 
-        while True:
-            player = random.randrange(len(self.players))
-            if hex_distribution_list[player] > 0:
-                hex_distribution_list[player] -= 1
-                return player
+        x = point[0] - self.camera.offset[0]
+        y = point[1] - self.camera.offset[1] - self.camera.side_length
+
+        # Point lies between middles of two neighbouring rows and between
+        # middles of two neighbouring hexes in every row. Both of them are
+        # tested, point on the edge shared by them is inside both
+        row = math.floor(y / self.camera.row_height)
+        for row_ in (row, row + 1):
+            column = math.floor(
+                (x / self.camera.half_side_length_root3 - row_ - 1) / 2)
+            for column_ in (column, column + 1):
+                hex_ = self.get_hex((column_, row_))
+                if hex_ and hex_.is_point_inside_polygon(point):
+                    return hex_
+
+        return None
 
-    def __create_dice_distribution_list(self):
+    def calculate_hex_polygon(self, hex_middle):
         '''
-        Creates list with number of dice per hex. Each element corresponds to hex on
-        flat 2d array map representation
+        Calculates and returns hex's polygon
+
+        Args:
+            hex_middle (int, int): hex's middle point coords
 
         Returns:
-            list(int): list with number of dice per hex
+            list(int, int): list of points forming hex's polygon
         '''
 
-        dice_left = 0
-        dice_distribution_list = [0] * self.hex_number
+        polygon = (
+            (hex_middle[0], hex_middle[1] + self.side_length),
+            (hex_middle[0] + self.half_side_length_root3,
+             hex_middle[1] + self.half_side_length),
+            (hex_middle[0] + self.half_side_length_root3,
+             hex_middle[1] - self.half_side_length),
+            (hex_middle[0], hex_middle[1] - self.side_length),
+            (hex_middle[0] - self.half_side_length_root3,
+             hex_middle[1] - self.half_side_length),
+            (hex_middle[0] - self.half_side_length_root3,
+             hex_middle[1] + self.half_side_length))
+
+        return polygon
 
-        # Randomly distributes dice, min dice_per_hex - 2, 
-        # max dice_per_hex + 1
-        # Leftovers are then randomly distributed to other hexes 
-        # with a maximum of dice_per_hex + 2
-        for hex_ in range(len(dice_distribution_list)):
-            dice_number = random.randrange(self.dice_per_hex - 2,
-                                           self.dice_per_hex + 1)
-            dice_left += self.dice_per_hex - dice_number
-            dice_distribution_list[hex_] = dice_number
+    def resize_polygons(self, side_length):
+        '''
+        Changes hex's side length, camera applies it to hex's polygons
+        at draw time. Side length >= MIN_SIDE_LENGTH and
+        <= MAX_SIDE_LENGTH
 
-        for die in range(dice_left):
-            while True:
-                hex_choosen = random.randrange(self.hex_number)
-                if dice_distribution_list[hex_choosen] < self.dice_per_hex + 2:
-                    dice_distribution_list[hex_choosen] += 1
-                    break
+        Args:
+            side_length (int) -- hex's side length
+        '''
 
-        return dice_distribution_list
+        if side_length >= MIN_SIDE_LENGTH and side_length <= MAX_SIDE_LENGTH:
+            self.camera.set_side_length(side_length)
 
-    def __is_dice_distribution_fair(self, dice_distribution_list,
-                                    fair_variation):
+    def move_polygons(self, pos_shift):
         '''
-        Returns True if variation between lowest and highest dice number is
-        smaller than fair_variation, otherwise returns False
+        Moves camera, and so hex's polygons, by given shift
 
         Args:
-            dice_distribution_list list(int): list with number of dice per
-                hex
-            fair_variation (float): maximum variation (between 0.2 and 0.4)
+            pos_shift (int, int): position shift
+        '''
+
+        self.camera.move(pos_shift)
+
+    def __grow_hex_region(self):
+        '''
+        Map is generated through adding new hexes to already existing
+        hexes sides. Frontier holds every empty field adjacent to already
+        added hexes, each step moves random field from frontier to the map,
+        so every step adds a hex
 
         Returns:
-            True if variation is smaller than fair_variation
-        '''
-
-        if not (0.2 <= fair_variation <= 0.4):
-            raise Exception('fair_variation isn\'t in possible range')
-
-        players_dice_number = {}
-        hex_list = [hex_ for hex_ in list(self.hex_map.flat) if type(hex_) ==
-                    Hex]
-
-        # Counts number of dice per player
-        for hex_number in range(len(dice_distribution_list)):
-            player = hex_list[hex_number].player
-            if player in players_dice_number:
-                players_dice_number[player] += dice_distribution_list[
-                    hex_number]
-            else:
-                players_dice_number[player] = dice_distribution_list[
-                    hex_number]
-
-        # Calcultes min, max and average and checks if variation is in
-        # range of fair_variation
-        min_ = min(players_dice_number.values())
-        max_ = max(players_dice_number.values())
-        average = sum(players_dice_number.values()) / len(players_dice_number)
-
-        if (average / min_ > 1.0 + fair_variation) or (average / max_ < 1.0 -
-           fair_variation):
-            return False
+            list(int): flat indices of added hexes in order of adding
+        '''
 
-        return True
+        neighbours = self.neighbours.tolist()
+        is_added = [False] * len(neighbours)
+
+        start = int(self.rng.integers(len(neighbours)))
+        frontier = [start]
+        frontier_positions = {start: 0}
+        hex_indices = []
 
-    def __distribute_dice_to_hexes(self, dice_distribution_list):
+        for random_number in self.rng.random(self.hex_number).tolist():
+            position = int(random_number * len(frontier))
+            index = frontier[position]
+
+            # Removes chosen field from frontier by swapping it with the last
+            last_index = frontier.pop()
+            if last_index != index:
+                frontier[position] = last_index
+                frontier_positions[last_index] = position
+            del frontier_positions[index]
+
+            is_added[index] = True
+            hex_indices.append(index)
+
+            for neighbour in neighbours[index]:
+                if neighbour >= 0 and not is_added[neighbour] and \
+                   neighbour not in frontier_positions:
+                    frontier_positions[neighbour] = len(frontier)
+                    frontier.append(neighbour)
+
+        return hex_indices
+
+    def __is_point_on_map(self, point):
         '''
-        Distributes dice to hexes
+        Returns True if point is in map's boundaries else False
 
         Args:
-            dice_distribution_list list(int): list with dice number per hex
+            point (int, int): (index on hex's 2d array map)
+
+        Returns:
+            True if it's inside map's boundaries
         '''
 
-        hex_list = [hex_ for hex_ in list(self.hex_map.flat) if type(hex_) ==
-                    Hex]
+        if (point[0] < 0 or point[0] >= self.shape[0]) or (point[1] < 0 or
+           point[1] >= self.shape[1]):
+            return False
 
-        for hex_ in range(len(dice_distribution_list)):
-            hex_list[hex_].dice_number += dice_distribution_list[hex_]
+        return True
 
     def create_map(self):
         '''
-        Initializes 2darray map with hex's objects.
+        Initializes board arrays with hexes.
         Distributes hexes to players and dice to hexes
         '''
 
-        self.pos_shift = [0, 0]
-
-        self.hex_map = numpy.zeros([self.size[0], self.size[1]], Hex)
+        self.camera.reset()
 
-        hex_distribution_list = self.__create_hex_distribution_list()
+        self.__init_board()
 
-        point = [random.randrange(self.size[0]), random.randrange(self.size[1])]
+        self.hex_number = min(self.hex_number, self.owners.size)
 
-        # Creates map. Starts with hex in random place and then ]
+        # Creates map. Starts with hex in random place and then
         # adds new hexes to its sides
-        i = 0
-        while i < self.hex_number:
-            point = self.__side_to_point_diff(random.randrange(6), point)
-            if not self.hex_map[point[0], point[1]]:
-                hex_middle = self.__calculate_hex_middle(point)
-                self.hex_map[point[0], point[1]] = Hex(
-                    hex_middle,
-                    self.calculate_hex_polygon(hex_middle),
-                    self.players[self.__choose_player(hex_distribution_list)])
-                i += 1
+        hex_indices = numpy.sort(self.__grow_hex_region())
+        self.occupied.flat[hex_indices] = True
+
+        # Distributes hexes to players and dice to hexes
+        owners = distribution.assign_owners(
+            self.hex_number, len(self.players), self.rng)
+        self.owners.flat[hex_indices] = owners
+        self.dice.flat[hex_indices] = distribution.create_dice_distribution(
+            owners, len(self.players), self.dice_per_hex, self.rng)
+
+        self.__init_regions()
+
+
+    def get_visible_indices(self, right_bar_rect):
+        '''
+        Returns flat indices of hexes in rendering range. Result is cached
+        until camera or map's layout changes
+
+        Arguments:
+            right_bar_rect (list(int)): side bar rectangle
+
+        Returns:
+            numpy.ndarray: hex's indices in flat 2d array representation
+        '''
+
+        cache_key = (self.camera.version, self.layout_version,
+                     right_bar_rect[0], self.window_size[1])
+        if self.visible_indices_cache[0] == cache_key:
+            return self.visible_indices_cache[1]
 
-        # Distributes dice between hexes until it's not fair distribution
-        while True:
-            dice_distribution_list = self.__create_dice_distribution_list()
-            if self.__is_dice_distribution_fair(dice_distribution_list, 0.3):
-                break
+        indices = self.get_hex_indices_in_rect(
+            (0, 0, right_bar_rect[0], self.window_size[1]))
+        self.visible_indices_cache = (cache_key, indices)
 
-        self.__distribute_dice_to_hexes(dice_distribution_list)
+        return indices
 
+    def get_hex_indices_in_rect(self, rect, offset=None):
+        '''
+        Returns flat indices of hexes overlapping rectangle. Range of rows
+        and columns which can overlap it is calculated from camera, so
+        only hexes close to the rectangle are checked
+
+        Arguments:
+            rect (int, int, int, int): rectangle's left, top, right and
+                bottom on screen
+
+            offset (int, int): offset used instead of camera's one
+
+        Returns:
+            numpy.ndarray: hex's indices in flat 2d array representation
+        '''
+
+        if offset is None:
+            offset = self.camera.offset
+
+        side_length = self.camera.side_length
+        root3 = self.camera.half_side_length_root3
+        left, top, right, bottom = rect
+
+        # Rows with middle_y in [top - side_length, bottom + side_length]
+        first_row = max(0, math.ceil(
+            (top - offset[1] - 2 * side_length) / self.camera.row_height))
+        last_row = min(self.shape[1] - 1, math.floor(
+            (bottom - offset[1]) / self.camera.row_height))
+
+        # Columns with middle_x in [left - root3, right + root3] in
+        # any of these rows. Middle_x = (2 * column + row + 1) * root3
+        first_column = max(0, math.ceil(
+            ((left - offset[0]) / root3 - 2 - last_row) / 2))
+        last_column = min(self.shape[0] - 1, math.floor(
+            ((right - offset[0]) / root3 - first_row) / 2))
+
+        indices = numpy.empty(0, dtype=numpy.int64)
+        if first_row <= last_row and first_column <= last_column:
+            columns, rows = numpy.nonzero(self.occupied[
+                first_column:last_column + 1, first_row:last_row + 1])
+            indices = (columns + first_column) * self.shape[1] + \
+                rows + first_row
+
+            middles = self.get_hex_middles(indices, offset)
+            is_inside = \
+                (middles[:, 0] + root3 >= left) & \
+                (middles[:, 0] - root3 <= right) & \
+                (middles[:, 1] + side_length >= top) & \
+                (middles[:, 1] - side_length <= bottom)
+            indices = indices[is_inside]
+
+        return indices
 
     def get_visibile_hex_list(self, right_bar_rect):
         '''
@@ -427,17 +675,5 @@ class Map:
             list(Hex): list of hexes in rendering range
         '''
 
-        hex_list = []
-        for i in range(self.hex_map.shape[0]):
-            for j in range(self.hex_map.shape[1]):
-                if type(self.hex_map[i, j]) == Hex:
-                    if ((i) * 2 * self.half_side_length_root3 +
-                        self.pos_shift[0]) + \
-                         ((j) * self.half_side_length_root3) <= \
-                         right_bar_rect[0]:
-                            if (j * (self.side_length +
-                                self.half_side_length)) + \
-                                 self.pos_shift[1] <= self.window_size[1]:
-                                hex_list.append(self.hex_map[i, j])
-
-        return hex_list
+        return [self.get_hex_by_index(index) for index in
+                self.get_visible_indices(right_bar_rect)]
@@ -0,0 +1,94 @@
+import functools
+import numpy
+
+
+@functools.lru_cache(maxsize=None)
+def get_dice_sum_distributions(die_sides_number, max_dice_number):
+    '''
+    Returns distributions of sums of rolled dice. Row n holds
+    probabilities of every sum of n dice, it's a discrete convolution of
+    n single die distributions
+
+    Args:
+        die_sides_number (int): how many sides single die has
+
+        max_dice_number (int): maximum ammount of rolled dice
+
+    Returns:
+        numpy.ndarray: (max_dice_number + 1, max_sum + 1) probabilities
+    '''
+
+    die_distribution = numpy.full(die_sides_number + 1,
+                                  1.0 / die_sides_number)
+    die_distribution[0] = 0.0
+
+    distributions = numpy.zeros(
+        (max_dice_number + 1, max_dice_number * die_sides_number + 1))
+    distributions[0, 0] = 1.0
+
+    for dice_number in range(1, max_dice_number + 1):
+        max_sum = dice_number * die_sides_number
+        distributions[dice_number, :max_sum + 1] = numpy.convolve(
+            distributions[dice_number - 1, :max_sum - die_sides_number + 1],
+            die_distribution)
+
+    distributions.flags.writeable = False
+
+    return distributions
+
+
+@functools.lru_cache(maxsize=None)
+def get_win_probability_table(die_sides_number, max_dice_number):
+    '''
+    Returns table of probabilities that attacker wins a fight. Element
+    [a, d] is probability that sum of a dice is higher than sum of d dice
+
+    Args:
+        die_sides_number (int): how many sides single die has
+
+        max_dice_number (int): maximum ammount of dice on a single hex
+
+    Returns:
+        numpy.ndarray: (max_dice_number + 1, max_dice_number + 1)
+            probabilities
+    '''
+
+    distributions = get_dice_sum_distributions(die_sides_number,
+                                               max_dice_number)
+
+    # Probability that defender's sum is lower than given sum
+    lower_sum_probabilities = numpy.zeros(distributions.shape)
+    lower_sum_probabilities[:, 1:] = numpy.cumsum(
+        distributions, axis=1)[:, :-1]
+
+    table = numpy.clip(distributions @ lower_sum_probabilities.T, 0.0, 1.0)
+    table.flags.writeable = False
+
+    return table
+
+
+def get_win_probability(attacking_dice_number, defending_dice_number,
+                        die_sides_number, max_dice_number):
+    '''
+    Returns probability that attacker wins a fight
+
+    Args:
+        attacking_dice_number (int): number of attacking dice
+
+        defending_dice_number (int): number of defending dice
+
+        die_sides_number (int): how many sides single die has
+
+        max_dice_number (int): maximum ammount of dice on a single hex,
+            the table is built and memoized for it
+
+    Returns:
+        float: probability that attacker wins
+    '''
+
+    max_dice_number = max(max_dice_number, attacking_dice_number,
+                          defending_dice_number)
+
+    return float(get_win_probability_table(
+        die_sides_number, max_dice_number)[attacking_dice_number,
+                                           defending_dice_number])
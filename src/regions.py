@@ -0,0 +1,276 @@
+import collections
+import numpy
+
+
+class RegionIndex:
+    '''
+    Disjoint-set index of connected regions of every player's hexes.
+    Every region keeps list of its hexes and every hex points directly to
+    its region's root, so merging moves hexes of the smaller region.
+    Hex changing its owner splits only the region it has left
+    '''
+
+    def __init__(self, owners, neighbours, players_number):
+        '''
+        Initializes RegionIndex object and builds regions
+
+        Args:
+            owners (numpy.ndarray): owner of every field, -1 if there is
+                no hex on the field
+
+            neighbours (numpy.ndarray): (N, 6) neighbours table of the map
+
+            players_number (int): ammount of players
+        '''
+
+        self.owners = owners.ravel().tolist()
+        self.neighbours = neighbours.tolist()
+
+        self.roots = [-1] * len(self.owners)
+        self.members = {}
+
+        # Ammount of regions of given size for every player
+        self.region_sizes = [collections.Counter()
+                             for player in range(players_number)]
+        # Size of the largest region for every player, None if it has to
+        # be recalculated
+        self.largest_region_sizes = [0] * players_number
+
+        for index, owner in enumerate(self.owners):
+            if owner >= 0:
+                self.__add_hex(index)
+
+    def __add_region(self, owner, root, members):
+        '''
+        Registers region with given root and members. Members have to
+        point to the root already
+
+        Args:
+            owner (int): region's owner
+
+            root (int): region's root
+
+            members (list(int)): flat indices of region's hexes
+        '''
+
+        self.members[root] = members
+
+        size = len(members)
+        self.region_sizes[owner][size] += 1
+        largest = self.largest_region_sizes[owner]
+        if largest is not None and size > largest:
+            self.largest_region_sizes[owner] = size
+
+    def __remove_region(self, owner, root):
+        '''
+        Unregisters region and returns its members
+
+        Args:
+            owner (int): region's owner
+
+            root (int): region's root
+
+        Returns:
+            list(int): flat indices of region's hexes
+        '''
+
+        members = self.members.pop(root)
+
+        size = len(members)
+        self.region_sizes[owner][size] -= 1
+        if not self.region_sizes[owner][size]:
+            del self.region_sizes[owner][size]
+        if size == self.largest_region_sizes[owner]:
+            self.largest_region_sizes[owner] = None
+
+        return members
+
+    def __union(self, index, other_index):
+        '''
+        Merges regions of two hexes of the same owner
+
+        Args:
+            index (int): hex's flat index
+
+            other_index (int): other hex's flat index
+        '''
+
+        root = self.roots[index]
+        other_root = self.roots[other_index]
+        if root == other_root:
+            return
+
+        if len(self.members[root]) < len(self.members[other_root]):
+            root, other_root = other_root, root
+
+        owner = self.owners[index]
+        members = self.__remove_region(owner, root)
+        other_members = self.__remove_region(owner, other_root)
+
+        for member in other_members:
+            self.roots[member] = root
+        members.extend(other_members)
+
+        self.__add_region(owner, root, members)
+
+    def __add_hex(self, index):
+        '''
+        Adds hex as a single region and merges it with adjacent regions
+        of the same owner
+
+        Args:
+            index (int): hex's flat index
+        '''
+
+        owner = self.owners[index]
+        self.roots[index] = index
+        self.__add_region(owner, index, [index])
+
+        for neighbour in self.neighbours[index]:
+            if neighbour >= 0 and self.owners[neighbour] == owner and \
+               self.roots[neighbour] >= 0:
+                self.__union(index, neighbour)
+
+    def __remove_hex(self, index):
+        '''
+        Removes hex from its region and splits the rest of the region
+        into connected parts
+
+        Args:
+            index (int): hex's flat index
+        '''
+
+        owner = self.owners[index]
+        members = self.__remove_region(owner, self.roots[index])
+
+        self.roots[index] = -1
+        for member in members:
+            if member != index:
+                self.roots[member] = -1
+
+        # Flood fills parts of the region which are left
+        for member in members:
+            if self.roots[member] >= 0 or member == index:
+                continue
+
+            part = [member]
+            self.roots[member] = member
+            for part_member in part:
+                for neighbour in self.neighbours[part_member]:
+                    if neighbour >= 0 and neighbour != index and \
+                       self.roots[neighbour] < 0 and \
+                       self.owners[neighbour] == owner:
+                        self.roots[neighbour] = member
+                        part.append(neighbour)
+
+            self.__add_region(owner, member, part)
+
+    def set_owner(self, index, owner):
+        '''
+        Updates regions after hex has changed its owner
+
+        Args:
+            index (int): hex's flat index
+
+            owner (int): new owner
+        '''
+
+        if self.owners[index] == owner:
+            return
+
+        if self.owners[index] >= 0:
+            self.__remove_hex(index)
+
+        self.owners[index] = owner
+        if owner >= 0:
+            self.__add_hex(index)
+
+    def get_largest_region_size(self, owner):
+        '''
+        Returns ammount of hexes in player's largest connected region
+
+        Args:
+            owner (int): player's index
+
+        Returns:
+            int: ammount of connected hexes
+        '''
+
+        if self.largest_region_sizes[owner] is None:
+            self.largest_region_sizes[owner] = max(
+                self.region_sizes[owner], default=0)
+
+        return self.largest_region_sizes[owner]
+
+
+def label_regions(owners, neighbours):
+    '''
+    Labels connected regions of all players at once. Every hex gets the
+    lowest flat index in its region as a label. Labels are propagated
+    from neighbours of the same owner and shortcut through labels of
+    labels until nothing changes
+
+    Args:
+        owners (numpy.ndarray): owner of every field, -1 if there is
+            no hex on the field
+
+        neighbours (numpy.ndarray): (N, 6) neighbours table of the map
+
+    Returns:
+        numpy.ndarray: label of every field, -1 if there is no hex
+    '''
+
+    owners = owners.ravel()
+    indices = numpy.arange(len(owners))
+
+    # Every field is connected to itself and to neighbours of the same
+    # owner, other directions point back to the field
+    is_connected = (neighbours >= 0) & (owners[:, numpy.newaxis] >= 0) & \
+        (owners[neighbours] == owners[:, numpy.newaxis])
+    connections = numpy.where(is_connected, neighbours,
+                              indices[:, numpy.newaxis])
+
+    labels = indices
+    while True:
+        new_labels = labels[connections].min(axis=1)
+
+        # Every label points to a field with the same or lower label
+        while True:
+            shortcut_labels = new_labels[new_labels]
+            if numpy.array_equal(shortcut_labels, new_labels):
+                break
+            new_labels = shortcut_labels
+
+        if numpy.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    return numpy.where(owners >= 0, labels, -1)
+
+
+def get_largest_region_sizes(owners, neighbours, players_number):
+    '''
+    Returns ammount of hexes in the largest connected region of every
+    player, computed with a single labelling pass
+
+    Args:
+        owners (numpy.ndarray): owner of every field, -1 if there is
+            no hex on the field
+
+        neighbours (numpy.ndarray): (N, 6) neighbours table of the map
+
+        players_number (int): ammount of players
+
+    Returns:
+        numpy.ndarray: size of the largest region for every player
+    '''
+
+    owners = owners.ravel()
+    labels = label_regions(owners, neighbours)
+    labels = labels[labels >= 0]
+
+    roots, sizes = numpy.unique(labels, return_counts=True)
+    largest_region_sizes = numpy.zeros(players_number, dtype=numpy.int64)
+    numpy.maximum.at(largest_region_sizes, owners[roots], sizes)
+
+    return largest_region_sizes
@@ -0,0 +1,184 @@
+import collections
+import numpy
+import pygame
+
+
+class TileCache:
+    '''
+    Cache of the board drawn at current zoom, split into square tiles.
+    Tiles are drawn on demand and the least recently used ones are dropped
+    when their pixels exceed the budget, so memory doesn't depend on
+    map's size
+    '''
+
+    def __init__(self, tile_size, max_pixels, draw_tile, surface, margin=2):
+        '''
+        Initializes TileCache object
+
+        Args:
+            tile_size (int): tile's side in pixels
+
+            max_pixels (int): maximum ammount of pixels of all cached tiles
+
+            draw_tile (function): draws board on tile, called with tile's
+                surface and its rectangle in board space, see
+                get_surface_rect
+
+            surface (pygame.Surface): tiles have the same pixel format as
+                this surface
+
+            margin (int): tile's surface is bigger by margin on every
+                side, so polygons clipped at its edges don't differ from
+                polygons drawn whole in tile's area
+        '''
+
+        self.tile_size = tile_size
+        self.margin = margin
+        self.max_tiles = max(1, max_pixels // (tile_size + 2 * margin) ** 2)
+        self.draw_tile = draw_tile
+        self.surface = surface
+
+        # Part of tile's surface which is blitted
+        self.area = pygame.Rect(margin, margin, tile_size, tile_size)
+
+        self.tiles = collections.OrderedDict()
+
+    def clear(self):
+        '''
+        Drops all tiles
+        '''
+
+        self.tiles.clear()
+
+    def get_tile_rect(self, coords):
+        '''
+        Returns tile's rectangle in board space
+
+        Args:
+            coords (int, int): tile's column and row
+
+        Returns:
+            pygame.Rect: tile's rectangle
+        '''
+
+        return pygame.Rect(coords[0] * self.tile_size,
+                           coords[1] * self.tile_size,
+                           self.tile_size, self.tile_size)
+
+    def get_surface_rect(self, coords):
+        '''
+        Returns rectangle of tile's surface with margin in board space
+
+        Args:
+            coords (int, int): tile's column and row
+
+        Returns:
+            pygame.Rect: rectangle of tile's surface
+        '''
+
+        return self.get_tile_rect(coords).inflate(2 * self.margin,
+                                                  2 * self.margin)
+
+    def get_tile_coords(self, rect):
+        '''
+        Returns coords of tiles overlapping rectangle
+
+        Args:
+            rect (pygame.Rect): rectangle in board space
+
+        Returns:
+            list((int, int)): tiles' columns and rows
+        '''
+
+        if not rect.width or not rect.height:
+            return []
+
+        return [(column, row)
+                for row in range(rect.top // self.tile_size,
+                                 (rect.bottom - 1) // self.tile_size + 1)
+                for column in range(rect.left // self.tile_size,
+                                    (rect.right - 1) // self.tile_size + 1)]
+
+    def get_cached_tile_hits(self, boxes):
+        '''
+        Returns every pair of box and cached tile overlapping it. All boxes
+        are processed at once, boxes have to be smaller than a tile, so
+        every box overlaps at most 2 x 2 tiles
+
+        Args:
+            boxes (numpy.ndarray): (n, 4) array of boxes' left, top, right
+                and bottom in board space
+
+        Returns:
+            list((int, (int, int))): box's index and tile's coords
+        '''
+
+        if not self.tiles or not len(boxes):
+            return []
+
+        first_tiles = boxes[:, :2] // self.tile_size
+        last_tiles = (boxes[:, 2:] - 1) // self.tile_size
+
+        # Corners of box's tiles range, repeated tiles are skipped
+        candidates = numpy.stack((
+            first_tiles,
+            numpy.stack((last_tiles[:, 0], first_tiles[:, 1]), axis=1),
+            numpy.stack((first_tiles[:, 0], last_tiles[:, 1]), axis=1),
+            last_tiles), axis=1)
+        is_new = numpy.stack((
+            numpy.ones(len(boxes), dtype=bool),
+            last_tiles[:, 0] != first_tiles[:, 0],
+            last_tiles[:, 1] != first_tiles[:, 1],
+            (last_tiles != first_tiles).all(axis=1)), axis=1)
+
+        cached = numpy.array(list(self.tiles))
+        is_cached = ((candidates[:, :, numpy.newaxis, :] ==
+                      cached).all(axis=3)).any(axis=2)
+
+        boxes_indices, corners = numpy.nonzero(is_new & is_cached)
+
+        return [(box, tuple(coords)) for box, coords in zip(
+            boxes_indices.tolist(),
+            candidates[boxes_indices, corners].tolist())]
+
+    def get_cached_tile(self, coords):
+        '''
+        Returns tile's surface if it's cached, otherwise None
+
+        Args:
+            coords (int, int): tile's column and row
+
+        Returns:
+            pygame.Surface or None: tile
+        '''
+
+        return self.tiles.get(coords)
+
+    def get_tile(self, coords):
+        '''
+        Returns tile's surface, it's drawn if it isn't cached
+
+        Args:
+            coords (int, int): tile's column and row
+
+        Returns:
+            pygame.Surface: tile
+        '''
+
+        tile = self.tiles.get(coords)
+        if tile is not None:
+            self.tiles.move_to_end(coords)
+            return tile
+
+        # Surface of the least recently used tile is reused
+        if len(self.tiles) >= self.max_tiles:
+            tile = self.tiles.popitem(last=False)[1]
+        else:
+            tile = pygame.Surface((self.tile_size + 2 * self.margin,
+                                   self.tile_size + 2 * self.margin), 0,
+                                  self.surface)
+
+        self.draw_tile(tile, self.get_surface_rect(coords))
+        self.tiles[coords] = tile
+
+        return tile
@@ -0,0 +1,165 @@
+'''
+Self-play tournament. Plays many headless games in parallel processes
+and streams result of every game as a JSON line as soon as it's finished.
+Games settings are drawn from the same ranges as sliders of the game:
+
+    python tournament.py --games 1000 --workers 8 --seed 0
+'''
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+import numpy
+
+import headless
+
+
+def create_game_options(seed_sequence, arguments):
+    '''
+    Draws settings of a single game
+
+    Args:
+        seed_sequence (numpy.random.SeedSequence): game's seed sequence
+
+        arguments (argparse.Namespace): tournament's arguments
+
+    Returns:
+        dict: arguments of HeadlessGame
+    '''
+
+    rng = numpy.random.default_rng(seed_sequence)
+
+    def draw(range_):
+        return int(rng.integers(range_[0], range_[1] + 1))
+
+    map_size = (draw(arguments.map_size), draw(arguments.map_size))
+    hex_number = int(draw(arguments.coverage) / 100 *
+                     map_size[0] * map_size[1])
+    players_number = min(draw(arguments.players), hex_number)
+
+    return {
+        'map_size': map_size,
+        'hex_number': hex_number,
+        'players_number': players_number,
+        'die_sides_number': draw(arguments.die_sides),
+        'max_dice_on_single_hex': draw(arguments.max_dice),
+        'max_rounds': arguments.max_rounds,
+        'seed': int(rng.integers(2 ** 63))
+    }
+
+
+def play_tournament_game(game_number, seed_sequence, arguments):
+    '''
+    Plays a single game of the tournament, it's run in worker process
+
+    Args:
+        game_number (int): game's number in tournament
+
+        seed_sequence (numpy.random.SeedSequence): game's seed sequence
+
+        arguments (argparse.Namespace): tournament's arguments
+
+    Returns:
+        dict: game's settings and result
+    '''
+
+    options = create_game_options(seed_sequence, arguments)
+
+    odds_players = min(arguments.odds_players, options['players_number'])
+    strategies = [headless.OddsStrategy(arguments.min_win_probability)] * \
+        odds_players + [None] * (options['players_number'] - odds_players)
+
+    start_time = time.perf_counter()
+    result = headless.play_game(strategies=strategies, **options)
+
+    return dict(options, **{
+        'game': game_number,
+        'odds_players': odds_players,
+        'winner': result.winner,
+        'rounds': result.rounds,
+        'fights': result.fights,
+        'hex_numbers': result.hex_numbers,
+        'time': time.perf_counter() - start_time
+    })
+
+
+def parse_arguments(argv=None):
+    '''
+    Parses command line arguments
+
+    Args:
+        argv (list(string)): arguments, sys.argv if None
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    '''
+
+    parser = argparse.ArgumentParser(description='Hex-Wars self-play '
+                                                 'tournament')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--map-size', type=int, nargs=2, default=(5, 100),
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--coverage', type=int, nargs=2, default=(10, 100),
+                        metavar=('MIN', 'MAX'),
+                        help='%% of the map covered in hexes')
+    parser.add_argument('--players', type=int, nargs=2, default=(2, 20),
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--die-sides', type=int, nargs=2, default=(2, 50),
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--max-dice', type=int, nargs=2, default=(2, 99),
+                        metavar=('MIN', 'MAX'))
+    parser.add_argument('--max-rounds', type=int, default=1000)
+    parser.add_argument('--odds-players', type=int, default=0,
+                        help='ammount of first players using OddsStrategy '
+                             'instead of gameplay\'s AI')
+    parser.add_argument('--min-win-probability', type=float, default=0.5)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    '''
+    Plays the tournament, prints results of games to stdout and summary
+    to stderr
+    '''
+
+    arguments = parse_arguments(argv)
+
+    # Every game gets independent random numbers stream, so results
+    # don't depend on ammount of workers or order of finishing
+    seed_sequences = numpy.random.SeedSequence(arguments.seed).spawn(
+        arguments.games)
+
+    wins = {}
+    start_time = time.perf_counter()
+
+    with concurrent.futures.ProcessPoolExecutor(arguments.workers) as \
+            executor:
+        futures = [executor.submit(play_tournament_game, game_number,
+                                   seed_sequence, arguments)
+                   for game_number, seed_sequence in
+                   enumerate(seed_sequences)]
+
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            print(json.dumps(result), flush=True)
+
+            winner = result['winner']
+            if winner is not None and winner < result['odds_players']:
+                winner = 'odds'
+            wins[str(winner)] = wins.get(str(winner), 0) + 1
+
+    elapsed_time = time.perf_counter() - start_time
+    print('{} games in {:.1f}s, {:.2f} games/s, wins by player: {}'.format(
+        arguments.games, elapsed_time, arguments.games / elapsed_time,
+        json.dumps(wins, sort_keys=True)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+'''
+Vector environment. Holds many independent boards of the same size with
+their state stacked along the leading axis and advances all of them with
+numpy at once. Follows rules of Gameplay: add_dice for reinforcements,
+fight and fight_finish for attacks and captures
+'''
+
+import numpy
+
+import dice
+import distribution
+import game
+import headless
+import map
+import regions
+
+
+class VectorEnv:
+    def __init__(self, boards_number, map_size, hex_number, players_number,
+                 die_sides_number=6, max_dice_on_single_hex=8,
+                 dice_per_hex=4, seed=None):
+        '''
+        Initializes VectorEnv object and creates boards
+
+        Args:
+            boards_number (int): ammount of independent boards
+
+            map_size (int, int): map's size in hexes
+
+            hex_number (int): ammount of hexes on every board
+
+            players_number (int): ammount of players on every board
+
+            die_sides_number (int): how many sides single die has
+
+            max_dice_on_single_hex (int): maximum ammount of dice
+                on a single hex
+
+            dice_per_hex (int): average count of dice per hex
+
+            seed (int): seed of environment's random numbers generator,
+                random if None
+        '''
+
+        self.boards_number = boards_number
+        self.map_size = map_size
+        self.hex_number = hex_number
+        self.players_number = players_number
+        self.die_sides_number = die_sides_number
+        self.max_dice_on_single_hex = max_dice_on_single_hex
+        self.dice_per_hex = dice_per_hex
+
+        self.rng = numpy.random.default_rng(seed)
+
+        self.reset()
+
+    def reset(self):
+        '''
+        Creates new boards, player 0 starts on all of them
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): observations, see
+                get_observations
+        '''
+
+        players = [game.Player((0, 0, 0))
+                   for player in range(self.players_number)]
+
+        for board, seed in enumerate(self.rng.integers(
+                2 ** 63, size=self.boards_number).tolist()):
+            map_ = map.Map(self.map_size, self.hex_number, players,
+                           self.dice_per_hex, headless.DEFAULT_SIDE_LENGTH,
+                           headless.WINDOW_SIZE, seed=seed)
+            map_.create_map()
+
+            if board == 0:
+                self.__init_boards(map_)
+
+            self.owners[board] = map_.owners.ravel()
+            self.dice[board] = map_.dice.ravel()
+
+        self.additional_dice = numpy.zeros(
+            (self.boards_number, self.players_number), dtype=numpy.int64)
+        self.current_players = numpy.zeros(self.boards_number,
+                                           dtype=numpy.int64)
+        self.hex_numbers = self.__count_hex_numbers()
+        self.__update_done()
+
+        return self.get_observations()
+
+    def __init_boards(self, map_):
+        '''
+        Initializes stacked board arrays and neighbours tables
+
+        Args:
+            map_ (Map): the first created map, all boards share its shape
+        '''
+
+        self.shape = map_.shape
+        fields_number = map_.owners.size
+
+        self.owners = numpy.empty((self.boards_number, fields_number),
+                                  dtype=numpy.int16)
+        self.dice = numpy.empty((self.boards_number, fields_number),
+                                dtype=numpy.uint8)
+
+        self.neighbours = map_.neighbours
+        # Missing neighbours point back to the field, it's owned by the
+        # attacking player so it's never a target
+        self.neighbours_or_self = numpy.where(
+            self.neighbours >= 0, self.neighbours,
+            numpy.arange(fields_number)[:, numpy.newaxis])
+
+        # Neighbours table of all boards flattened together, it's used to
+        # label regions of all boards in one pass
+        offsets = (numpy.arange(self.boards_number, dtype=numpy.int32) *
+                   fields_number)[:, numpy.newaxis, numpy.newaxis]
+        self.stacked_neighbours = numpy.where(
+            self.neighbours >= 0, self.neighbours + offsets, -1).reshape(
+                -1, self.neighbours.shape[1])
+
+    def get_observations(self):
+        '''
+        Returns owners and dice of all boards. These are views of
+        environment's arrays, nothing is copied
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): (boards, map_size[0],
+                map_size[1]) owners (-1 if there is no hex) and dice
+        '''
+
+        return (self.owners.reshape(self.boards_number, *self.shape),
+                self.dice.reshape(self.boards_number, *self.shape))
+
+    def get_hex_numbers(self):
+        '''
+        Returns ammount of hexes owned by every player on every board,
+        they are counted once and then updated by step
+
+        Returns:
+            numpy.ndarray: (boards, players) ammount of hexes
+        '''
+
+        return self.hex_numbers.copy()
+
+    def __count_hex_numbers(self):
+        '''
+        Counts hexes owned by every player on every board
+
+        Returns:
+            numpy.ndarray: (boards, players) ammount of hexes
+        '''
+
+        # Empty fields are counted as player -1 and dropped afterwards
+        offsets = numpy.arange(self.boards_number)[:, numpy.newaxis] * \
+            (self.players_number + 1) + 1
+
+        return numpy.bincount(
+            (self.owners + offsets).ravel(),
+            minlength=self.boards_number * (self.players_number + 1)).reshape(
+                self.boards_number, self.players_number + 1)[:, 1:]
+
+    def get_winners(self):
+        '''
+        Returns index of player who conquered all hexes of every board
+
+        Returns:
+            numpy.ndarray: winner of every board, -1 if game isn't over
+        '''
+
+        is_alive = self.get_hex_numbers() > 0
+
+        return numpy.where(is_alive.sum(axis=1) == 1,
+                           numpy.argmax(is_alive, axis=1), -1)
+
+    def __update_done(self):
+        '''
+        Marks boards where the game is over
+        '''
+
+        self.done = self.get_winners() >= 0
+
+    def get_largest_region_sizes(self, boards=None):
+        '''
+        Returns ammount of hexes in the largest connected region of every
+        player on chosen boards, all boards are labelled in one pass
+
+        Args:
+            boards (numpy.ndarray): indices of boards, all if None
+
+        Returns:
+            numpy.ndarray: (boards, players) sizes of the largest regions
+        '''
+
+        if boards is None:
+            boards = numpy.arange(self.boards_number)
+
+        owners = self.owners[boards].ravel()
+        labels = regions.label_regions(
+            owners, self.stacked_neighbours[:len(owners)])
+
+        roots, sizes = numpy.unique(labels[labels >= 0], return_counts=True)
+        largest_region_sizes = numpy.zeros(
+            len(boards) * self.players_number, dtype=numpy.int64)
+        numpy.maximum.at(
+            largest_region_sizes,
+            roots // self.owners.shape[1] * self.players_number +
+            owners[roots], sizes)
+
+        return largest_region_sizes.reshape(len(boards),
+                                            self.players_number)
+
+    def sample_attacks(self):
+        '''
+        Returns random possible attack of current player on every board.
+        Only hexes of current players which can attack are gathered with
+        their neighbours, not whole boards
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): flat indices of attacking and
+                defending hexes, -1 if there is no possible attack
+        '''
+
+        attacking_indices = numpy.full(self.boards_number, -1,
+                                       dtype=numpy.int64)
+        defending_indices = numpy.full(self.boards_number, -1,
+                                       dtype=numpy.int64)
+
+        # Flat indices of candidates in all boards, sorted by board
+        fields_number = self.owners.shape[1]
+        owners = self.owners.ravel()
+        candidates = numpy.flatnonzero(
+            (self.owners == self.current_players[:, numpy.newaxis]) &
+            (self.dice > 1) & ~self.done[:, numpy.newaxis])
+        hexes = candidates % fields_number
+
+        neighbours = self.neighbours_or_self[hexes]
+        defending_owners = owners[(candidates - hexes)[:, numpy.newaxis] +
+                                  neighbours]
+        is_possible = (defending_owners >= 0) & \
+            (defending_owners != owners[candidates][:, numpy.newaxis])
+
+        can_attack = is_possible.any(axis=1)
+        candidates = candidates[can_attack]
+        if not len(candidates):
+            return attacking_indices, defending_indices
+
+        boards = candidates // fields_number
+        hexes = hexes[can_attack]
+        neighbours = neighbours[can_attack]
+        is_possible = is_possible[can_attack]
+
+        # Random hex which can attack on every board and then random
+        # target of that hex
+        attacking_boards, starts, counts = numpy.unique(
+            boards, return_index=True, return_counts=True)
+        chosen = starts + (self.rng.random(len(starts)) *
+                           counts).astype(numpy.int64)
+        targets = numpy.argmax(numpy.where(
+            is_possible[chosen],
+            self.rng.random((len(chosen), is_possible.shape[1])), -1.0),
+            axis=1)
+
+        attacking_indices[attacking_boards] = hexes[chosen]
+        defending_indices[attacking_boards] = neighbours[chosen, targets]
+
+        return attacking_indices, defending_indices
+
+    def step(self, attacking_indices, defending_indices):
+        '''
+        Current player of every board attacks. Attacks breaking game's
+        rules and attacks on finished boards are ignored
+
+        Args:
+            attacking_indices (numpy.ndarray): flat index of attacking hex
+                on every board, -1 means no attack
+
+            defending_indices (numpy.ndarray): flat index of defending hex
+                on every board, -1 means no attack
+
+        Returns:
+            (numpy.ndarray, numpy.ndarray): True for every board where
+                attack was made and True for every board where it was won
+        '''
+
+        boards = numpy.arange(self.boards_number)
+        attacking_indices = numpy.asarray(attacking_indices,
+                                          dtype=numpy.int64)
+        defending_indices = numpy.asarray(defending_indices,
+                                          dtype=numpy.int64)
+
+        is_attack = (attacking_indices >= 0) & (defending_indices >= 0) & \
+            ~self.done
+        attacking_indices = numpy.where(is_attack, attacking_indices, 0)
+        defending_indices = numpy.where(is_attack, defending_indices, 0)
+
+        attacking_dice = self.dice[boards, attacking_indices].astype(
+            numpy.int64)
+        defending_dice = self.dice[boards, defending_indices].astype(
+            numpy.int64)
+        defending_owners = self.owners[boards, defending_indices]
+
+        is_attack &= \
+            (self.owners[boards, attacking_indices] ==
+             self.current_players) & (attacking_dice > 1) & \
+            (defending_owners >= 0) & \
+            (defending_owners != self.current_players) & \
+            (self.neighbours[attacking_indices] ==
+             defending_indices[:, numpy.newaxis]).any(axis=1)
+
+        fights = numpy.flatnonzero(is_attack)
+        attacking_powers, defending_powers, is_won = dice.resolve_fights(
+            self.rng, attacking_dice[fights], defending_dice[fights],
+            self.die_sides_number)
+
+        # If attacking player has won the fight conquer defending hex
+        # Leaving one dice behind and move dice to conquered hex
+        won = fights[is_won]
+        self.owners[won, defending_indices[won]] = self.current_players[won]
+        self.dice[won, defending_indices[won]] = attacking_dice[won] - 1
+        self.dice[fights, attacking_indices[fights]] = 1
+        self.hex_numbers[won, self.current_players[won]] += 1
+        self.hex_numbers[won, defending_owners[won]] -= 1
+
+        if len(won):
+            self.__update_done()
+
+        is_won_on_board = numpy.zeros(self.boards_number, dtype=bool)
+        is_won_on_board[won] = True
+
+        return is_attack, is_won_on_board
+
+    def reinforce(self, boards_mask):
+        '''
+        Adds dice to current player's hexes on chosen boards, the same way
+        as Gameplay.add_dice
+
+        Args:
+            boards_mask (numpy.ndarray): True for every board to reinforce
+        '''
+
+        boards = numpy.flatnonzero(boards_mask)
+        if not len(boards):
+            return
+
+        current_players = self.current_players[boards]
+
+        is_owned = self.owners[boards] == current_players[:, numpy.newaxis]
+        capacities = numpy.where(
+            is_owned, self.max_dice_on_single_hex -
+            self.dice[boards].astype(numpy.int64), 0).clip(0)
+        max_dice_to_add = capacities.sum(axis=1)
+
+        dice_to_add = self.get_largest_region_sizes(boards)[
+            numpy.arange(len(boards)), current_players] + \
+            self.additional_dice[boards, current_players]
+
+        # Leftovers are stored as additional dice, maximum leftover is
+        # 4 * max_dice_on_single_hex
+        self.additional_dice[boards, current_players] = \
+            (dice_to_add - max_dice_to_add).clip(
+                0, 4 * self.max_dice_on_single_hex)
+
+        self.dice[boards] += distribution.bounded_multinomials(
+            numpy.minimum(dice_to_add, max_dice_to_add), capacities,
+            self.rng).astype(numpy.uint8)
+
+    def end_turn(self, boards_mask=None):
+        '''
+        Reinforces current player and passes turn to the next player who
+        still has hexes
+
+        Args:
+            boards_mask (numpy.ndarray): True for every board where turn
+                ends, all unfinished boards if None
+        '''
+
+        if boards_mask is None:
+            boards_mask = ~self.done
+        boards_mask = numpy.asarray(boards_mask, dtype=bool) & ~self.done
+
+        self.reinforce(boards_mask)
+
+        # Next players in order, starting after current player
+        players_order = (self.current_players[:, numpy.newaxis] + 1 +
+                         numpy.arange(self.players_number)) % \
+            self.players_number
+        is_alive = numpy.take_along_axis(self.get_hex_numbers() > 0,
+                                         players_order, axis=1)
+        next_players = players_order[numpy.arange(self.boards_number),
+                                     numpy.argmax(is_alive, axis=1)]
+
+        self.current_players = numpy.where(boards_mask, next_players,
+                                           self.current_players)
@@ -0,0 +1,79 @@
+'''
+Checks that fights are reproducible with seeded generators. Run from
+repository root:
+
+    python -m pytest tests
+'''
+
+import os
+import sys
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import dice
+
+
+DIE_SIDES_NUMBER = 6
+FIGHTS_NUMBER = 500
+
+
+def create_fights(seed):
+    '''
+    Returns ammount of attacking and defending dice of random fights
+    '''
+
+    rng = numpy.random.default_rng(seed)
+
+    return (rng.integers(2, 9, size=FIGHTS_NUMBER),
+            rng.integers(1, 9, size=FIGHTS_NUMBER))
+
+
+def test_roll_fight_is_reproducible():
+    attacking_dice_numbers, defending_dice_numbers = create_fights(0)
+    first_rng = numpy.random.default_rng(42)
+    second_rng = numpy.random.default_rng(42)
+
+    for attacking_dice_number, defending_dice_number in zip(
+            attacking_dice_numbers.tolist(), defending_dice_numbers.tolist()):
+        assert dice.roll_fight(
+            first_rng, attacking_dice_number, defending_dice_number,
+            DIE_SIDES_NUMBER) == dice.roll_fight(
+                second_rng, attacking_dice_number, defending_dice_number,
+                DIE_SIDES_NUMBER)
+
+
+def test_resolve_fights_matches_roll_fight():
+    attacking_dice_numbers, defending_dice_numbers = create_fights(1)
+
+    rng = numpy.random.default_rng(7)
+    powers = [dice.roll_fight(rng, attacking_dice_number,
+                              defending_dice_number, DIE_SIDES_NUMBER)
+              for attacking_dice_number, defending_dice_number in zip(
+                  attacking_dice_numbers.tolist(),
+                  defending_dice_numbers.tolist())]
+    attacking_powers, defending_powers = numpy.array(powers).T
+
+    resolved = dice.resolve_fights(numpy.random.default_rng(7),
+                                   attacking_dice_numbers,
+                                   defending_dice_numbers, DIE_SIDES_NUMBER)
+
+    assert numpy.array_equal(resolved[0], attacking_powers)
+    assert numpy.array_equal(resolved[1], defending_powers)
+    assert numpy.array_equal(resolved[2],
+                             attacking_powers > defending_powers)
+
+
+def test_powers_are_in_possible_range():
+    attacking_dice_numbers, defending_dice_numbers = create_fights(2)
+    attacking_powers, defending_powers, is_won = dice.resolve_fights(
+        numpy.random.default_rng(3), attacking_dice_numbers,
+        defending_dice_numbers, DIE_SIDES_NUMBER)
+
+    assert (attacking_powers >= attacking_dice_numbers).all()
+    assert (attacking_powers <=
+            attacking_dice_numbers * DIE_SIDES_NUMBER).all()
+    assert (defending_powers >= defending_dice_numbers).all()
+    assert (defending_powers <=
+            defending_dice_numbers * DIE_SIDES_NUMBER).all()
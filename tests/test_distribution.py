@@ -0,0 +1,62 @@
+'''
+Checks bounds of random distributions of dice and hexes. Run from
+repository root:
+
+    python -m pytest tests
+'''
+
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import distribution
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_bounded_multinomial_respects_capacity(seed):
+    rng = numpy.random.default_rng(seed)
+    capacity = rng.integers(0, 6, size=rng.integers(1, 30))
+    total = int(rng.integers(0, capacity.sum() + 1))
+
+    added = distribution.bounded_multinomial(total, capacity, rng)
+
+    assert (added >= 0).all()
+    assert (added <= capacity).all()
+    assert added.sum() == total
+
+
+def test_bounded_multinomial_without_slots():
+    rng = numpy.random.default_rng(0)
+
+    assert len(distribution.bounded_multinomial(5, [], rng)) == 0
+    assert distribution.bounded_multinomial(0, [3, 2], rng).tolist() == \
+        [0, 0]
+
+
+def test_bounded_multinomials_respect_capacities():
+    rng = numpy.random.default_rng(0)
+    capacities = rng.integers(0, 6, size=(200, 25))
+    totals = (capacities.sum(axis=1) * rng.random(200)).astype(numpy.int64)
+
+    added = distribution.bounded_multinomials(totals, capacities, rng)
+
+    assert (added >= 0).all()
+    assert (added <= capacities).all()
+    assert numpy.array_equal(added.sum(axis=1), totals)
+
+
+@pytest.mark.parametrize('hex_number, players_number',
+                         [(10, 3), (100, 7), (7, 7), (5, 8), (1000, 13)])
+def test_assign_owners_is_fair(hex_number, players_number):
+    rng = numpy.random.default_rng(hex_number)
+
+    owners = distribution.assign_owners(hex_number, players_number, rng)
+    hex_numbers = numpy.bincount(owners, minlength=players_number)
+
+    assert len(owners) == hex_number
+    assert owners.min() >= 0 and owners.max() < players_number
+    assert hex_numbers.max() - hex_numbers.min() <= 1
@@ -0,0 +1,56 @@
+'''
+Compares picking of hexes with a brute force polygon test of every hex.
+Run from repository root:
+
+    python -m pytest tests
+'''
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import game
+import map
+
+
+@pytest.fixture(scope='module')
+def map_():
+    players = [game.Player((0, 0, 0)) for player in range(3)]
+    map_ = map.Map((6, 6), 30, players, 4, 32, (1920, 1080), seed=1)
+    map_.create_map()
+
+    return map_
+
+
+@pytest.mark.parametrize('side_length', [6, 14, 32])
+@pytest.mark.parametrize('offset', [(0, 0), (37, -11), (-5, 23)])
+def test_pick_hex_matches_polygon_test(map_, side_length, offset):
+    map_.camera.reset()
+    map_.resize_polygons(side_length)
+    map_.move_polygons(offset)
+
+    hexes = map_.get_hex_list()
+    middles = [hex_.middle for hex_ in hexes]
+    width, height = map_.get_board_size()
+    step = max(1, side_length // 8)
+
+    # Every point around the board, edges shared by hexes included
+    for x in range(offset[0] - 2, offset[0] + width + 2, step):
+        for y in range(offset[1] - 2, offset[1] + height + 2, step):
+            point = (x, y)
+            # Only hexes whose bounding box contains point are tested
+            is_inside = any(
+                hex_.is_point_inside_polygon(point)
+                for hex_, middle in zip(hexes, middles)
+                if abs(x - middle[0]) <= map_.half_side_length_root3 and
+                abs(y - middle[1]) <= map_.side_length)
+            hex_ = map_.pick_hex(point)
+
+            if is_inside:
+                assert hex_ is not None and \
+                    hex_.is_point_inside_polygon(point), point
+            else:
+                assert hex_ is None, point
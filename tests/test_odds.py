@@ -0,0 +1,68 @@
+'''
+Compares exact win probabilities with brute force sums over all rolls.
+Run from repository root:
+
+    python -m pytest tests
+'''
+
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import game
+import map
+import odds
+
+
+def get_brute_force_win_probability(attacking_dice_number,
+                                    defending_dice_number, die_sides_number):
+    '''
+    Returns share of all possible rolls where attacker's sum is higher
+    '''
+
+    sides = range(1, die_sides_number + 1)
+    wins = 0
+    rolls = 0
+
+    for roll in itertools.product(
+            sides, repeat=attacking_dice_number + defending_dice_number):
+        wins += sum(roll[:attacking_dice_number]) > \
+            sum(roll[attacking_dice_number:])
+        rolls += 1
+
+    return wins / rolls
+
+
+def test_single_die_against_single_die():
+    assert odds.get_win_probability(1, 1, 6, 8) == pytest.approx(15 / 36)
+
+
+@pytest.mark.parametrize('attacking_dice_number, defending_dice_number, '
+                         'die_sides_number', [(2, 2, 6), (3, 1, 4),
+                                              (1, 3, 6), (2, 3, 3)])
+def test_table_matches_brute_force(attacking_dice_number,
+                                   defending_dice_number, die_sides_number):
+    assert odds.get_win_probability(
+        attacking_dice_number, defending_dice_number, die_sides_number,
+        8) == pytest.approx(get_brute_force_win_probability(
+            attacking_dice_number, defending_dice_number, die_sides_number))
+
+
+def test_gameplay_looks_up_dice_of_hexes():
+    players = [game.Player((0, 0, 0)), game.Player((0, 0, 0))]
+    map_ = map.Map((5, 5), 25, players, 4, 32, (1920, 1080), seed=0)
+    map_.create_map()
+    gameplay = game.Gameplay(map_, 6, 0, 8)
+
+    attacking_hex = map_.get_hex((0, 0))
+    defending_hex = map_.get_hex((0, 1))
+    attacking_hex.dice_number = 2
+    defending_hex.dice_number = 2
+
+    assert gameplay.get_attack_win_probability(
+        attacking_hex, defending_hex) == pytest.approx(
+            get_brute_force_win_probability(2, 2, 6))
@@ -0,0 +1,126 @@
+'''
+Cross-checks one-pass labelling and incremental region index against a
+flood fill on seeded maps with random changes of owners. Run from
+repository root:
+
+    python -m pytest tests
+'''
+
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import game
+import map
+import regions
+
+
+PLAYERS_NUMBER = 4
+TRANSFERS_NUMBER = 200
+
+
+def flood_fill_labels(owners, neighbours):
+    '''
+    Labels connected regions one by one, every hex gets the lowest flat
+    index in its region
+
+    Args:
+        owners (numpy.ndarray): owner of every field, -1 if there is
+            no hex on the field
+
+        neighbours (numpy.ndarray): (N, 6) neighbours table of the map
+
+    Returns:
+        numpy.ndarray: label of every field, -1 if there is no hex
+    '''
+
+    owners = owners.ravel()
+    labels = numpy.full(len(owners), -1, dtype=numpy.int64)
+
+    for start in range(len(owners)):
+        if owners[start] < 0 or labels[start] >= 0:
+            continue
+
+        labels[start] = start
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            for neighbour in neighbours[index]:
+                if neighbour >= 0 and labels[neighbour] < 0 and \
+                        owners[neighbour] == owners[start]:
+                    labels[neighbour] = start
+                    stack.append(neighbour)
+
+    return labels
+
+
+def flood_fill_largest_region_sizes(owners, neighbours, players_number):
+    '''
+    Returns size of the largest region of every player from flood fill
+    '''
+
+    owners = owners.ravel()
+    labels = flood_fill_labels(owners, neighbours)
+
+    largest_region_sizes = numpy.zeros(players_number, dtype=numpy.int64)
+    for label in numpy.unique(labels[labels >= 0]):
+        owner = owners[label]
+        largest_region_sizes[owner] = max(largest_region_sizes[owner],
+                                          (labels == label).sum())
+
+    return largest_region_sizes
+
+
+def create_map(seed, size=(15, 12), hex_number=120):
+    '''
+    Returns seeded map shared by PLAYERS_NUMBER players
+    '''
+
+    players = [game.Player((0, 0, 0)) for player in range(PLAYERS_NUMBER)]
+    map_ = map.Map(size, hex_number, players, 4, 32, (1920, 1080),
+                   seed=seed)
+    map_.create_map()
+
+    return map_
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_engines_agree_with_flood_fill(seed):
+    map_ = create_map(seed)
+    gameplay = game.Gameplay(map_, 6, 0, 8, regions_engine='labelling')
+    rng = numpy.random.default_rng(seed)
+    hex_indices = numpy.flatnonzero(map_.occupied)
+
+    for transfer in range(TRANSFERS_NUMBER):
+        map_.set_owner(int(rng.choice(hex_indices)),
+                       int(rng.integers(PLAYERS_NUMBER)))
+
+        expected_labels = flood_fill_labels(map_.owners, map_.neighbours)
+        expected_sizes = flood_fill_largest_region_sizes(
+            map_.owners, map_.neighbours, PLAYERS_NUMBER)
+
+        assert numpy.array_equal(
+            regions.label_regions(map_.owners, map_.neighbours),
+            expected_labels)
+        assert numpy.array_equal(
+            regions.get_largest_region_sizes(
+                map_.owners, map_.neighbours, PLAYERS_NUMBER),
+            expected_sizes)
+        assert numpy.array_equal(gameplay.get_largest_region_sizes(),
+                                 expected_sizes)
+        assert [map_.regions.get_largest_region_size(player_index)
+                for player_index in range(PLAYERS_NUMBER)] == \
+            expected_sizes.tolist()
+
+
+def test_full_map_has_single_region_per_owner():
+    map_ = create_map(0, (6, 6), 36)
+    map_.owners[:] = 0
+
+    assert regions.get_largest_region_sizes(
+        map_.owners, map_.neighbours, PLAYERS_NUMBER).tolist() == \
+        [36, 0, 0, 0]